@@ -5,37 +5,124 @@ Handles card upload, word import, and flexible data collection
 """
 
 import json
+import logging
 from aqt import mw, gui_hooks
 from aqt.utils import showInfo
-from aqt.qt import QTimer, QDialog, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout
+from aqt.qt import (
+    QTimer, QDialog, QVBoxLayout, QTreeView, QPushButton, QHBoxLayout,
+    QAbstractItemModel, QModelIndex, Qt
+)
 
-# Import all components
+# Only lightweight components are imported at startup; the rest is
+# imported where first used
 from .config import ConfigManager
-from .api_client import APIClient
-from .card_processor import CardProcessor
-from .review_processor import ReviewProcessor
-from .data_collector import DataCollector, CardDataCollector, ReviewDataCollector
 from .notifications import NotificationManager
-from .dialogs.settings import SettingsDialog
-from .dialogs.import_dialog import ImportDialog
+
+log = logging.getLogger(__name__)
+
+# (hook, callback) pairs appended by AnkiExtension, so they can be removed before re-registering
+_registered_hooks = []
+
+class _JsonNode:
+    """Tree node wrapping one key/value of the JSON data; children built on demand"""
+    
+    __slots__ = ('key', 'value', 'parent', 'row', 'children')
+    
+    def __init__(self, key, value, parent=None, row=0):
+        self.key = key
+        self.value = value
+        self.parent = parent
+        self.row = row
+        self.children = None
+    
+    def get_children(self):
+        if self.children is None:
+            if isinstance(self.value, dict):
+                items = self.value.items()
+            elif isinstance(self.value, list):
+                items = enumerate(self.value)
+            else:
+                items = ()
+            self.children = [_JsonNode(key, value, self, row) for row, (key, value) in enumerate(items)]
+        return self.children
+
+class JsonTreeModel(QAbstractItemModel):
+    """Read-only tree over JSON data that only materializes expanded nodes"""
+    
+    HEADERS = ["Key", "Value"]
+    
+    def __init__(self, data, parent=None):
+        super().__init__(parent)
+        self.root = _JsonNode("", data)
+    
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+    
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, self._node(parent).get_children()[row])
+    
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+    
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        # Answered from the raw value so collapsed branches are never expanded
+        value = self._node(parent).value
+        return isinstance(value, (dict, list)) and len(value) > 0
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).get_children())
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        
+        node = index.internalPointer()
+        if index.column() == 0:
+            return str(node.key)
+        
+        value = node.value
+        if isinstance(value, dict):
+            return f"{{{len(value)}}}"
+        if isinstance(value, list):
+            return f"[{len(value)}]"
+        return json.dumps(value, ensure_ascii=False)
 
 class JSONViewerDialog(QDialog):
     """Simple dialog to display JSON data"""
     
     def __init__(self, json_data, title="JSON Data"):
         super().__init__(mw)
+        self.json_data = json_data
         self.setWindowTitle(title)
         self.setMinimumSize(800, 600)
         self.setModal(True)
         
         layout = QVBoxLayout(self)
         
-        # Text area for JSON
-        self.text_edit = QTextEdit()
-        self.text_edit.setPlainText(json.dumps(json_data, indent=2, ensure_ascii=False))
-        self.text_edit.setReadOnly(True)
-        self.text_edit.setFont(mw.app.font())
-        layout.addWidget(self.text_edit)
+        # Tree view over the data; nodes are only built when expanded
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(JsonTreeModel(json_data, self.tree_view))
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setColumnWidth(0, 250)
+        self.tree_view.setFont(mw.app.font())
+        layout.addWidget(self.tree_view)
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -55,80 +142,125 @@ class JSONViewerDialog(QDialog):
     
     def copy_to_clipboard(self):
         """Copy JSON text to clipboard"""
-        mw.app.clipboard().setText(self.text_edit.toPlainText())
+        mw.app.clipboard().setText(json.dumps(self.json_data, indent=2, ensure_ascii=False))
         showInfo("JSON copied to clipboard!")
 
 class AnkiExtension:
     """Main extension controller - simple and linear"""
     
+    __slots__ = (
+        'config', 'api', 'card_processor', 'review_processor', 'data_collector',
+        '_collectors_ready', 'notifications', 'startup_completed',
+        'startup_results', 'startup_pending', '_settings_dialog'
+    )
+    
     def __init__(self):
         self.config = ConfigManager()
-        self.api = APIClient(self.config)
-        self.card_processor = CardProcessor()
-        self.review_processor = ReviewProcessor()
-        self.data_collector = DataCollector()
+        self.api = None
+        self.card_processor = None
+        self.review_processor = None
+        self.data_collector = None
+        self._collectors_ready = False
         self.notifications = NotificationManager()
         
         self.startup_completed = False
-        self.startup_timer = None
+        self.startup_results = {}
+        self.startup_pending = 0
+        self._settings_dialog = None  # Built on first open, then reused
         
-        self._setup_data_collectors()
         self._setup_menus()
         self._setup_hooks()
-
-    def closeEvent(self, event):
-        """Ensure proper cleanup on close"""
-        super().closeEvent(event)
+    
+    def _ensure_api(self):
+        """Create API client on first use"""
+        if self.api is None:
+            from .api_client import APIClient
+            self.api = APIClient(self.config)
+        return self.api
+    
+    def _ensure_collectors(self):
+        """Build processors and data collectors on first use"""
+        if not self._collectors_ready:
+            self._setup_data_collectors()
+            self._collectors_ready = True
+    
+    def _get_collector(self, name: str):
+        """Get a registered data collector, building collectors if needed"""
+        self._ensure_collectors()
+        return self.data_collector.get_collector(name)
     
     def _setup_data_collectors(self):
         """Register all available data collectors"""
+        from .card_processor import CardProcessor
+        from .data_collector import DataCollector, CardDataCollector
+        
+        # Card processor is shared with the import dialog, so it is always built
+        self.card_processor = CardProcessor()
+        self.data_collector = DataCollector()
+        
         card_collector = CardDataCollector(self.card_processor)
         self.data_collector.register_collector(card_collector)
         
-        review_collector = ReviewDataCollector(self.review_processor, self.config)
-        self.data_collector.register_collector(review_collector)
+        # Review analytics are only built once something asks for them
+        self.data_collector.register_factory("reviews", self._create_review_collector)
+    
+    def _create_review_collector(self):
+        """Build the review collector and its processor"""
+        from .review_processor import ReviewProcessor
+        from .data_collector import ReviewDataCollector
+        
+        self.review_processor = ReviewProcessor()
+        return ReviewDataCollector(self.review_processor, self.config)
     
     def _setup_menus(self):
         """Setup menu items"""
-        mw.form.menuTools.addSeparator()
-        
-        settings_action = mw.form.menuTools.addAction("Word Management Settings")
-        settings_action.triggered.connect(self.show_settings)
-        
-        upload_action = mw.form.menuTools.addAction("📤 Upload Cards")
-        upload_action.triggered.connect(self.manual_upload)
-        
-        import_action = mw.form.menuTools.addAction("📥 Import Words")
-        import_action.triggered.connect(self.manual_import)
+        menu = mw.form.menuTools
+        menu.addSeparator()
         
-        analytics_action = mw.form.menuTools.addAction("📊 View Analytics")
-        analytics_action.triggered.connect(self.view_analytics)
-        
-        send_analytics_action = mw.form.menuTools.addAction("📊 Send Analytics")
-        send_analytics_action.triggered.connect(self.send_analytics)
-        
-        # Debug menu for viewing raw JSON
-        debug_action = mw.form.menuTools.addAction("🔍 Debug Analytics JSON")
-        debug_action.triggered.connect(self.debug_analytics_json)
+        for label, slot in (
+            ("Word Management Settings", self.show_settings),
+            ("📤 Upload Cards", self.manual_upload),
+            ("📥 Import Words", self.manual_import),
+            ("📊 View Analytics", self.view_analytics),
+            ("📊 Send Analytics", self.send_analytics),
+            ("🔍 Debug Analytics JSON", self.debug_analytics_json),  # Raw JSON for debugging
+        ):
+            menu.addAction(label).triggered.connect(slot)
     
     def _setup_hooks(self):
         """Setup Anki hooks"""
-        gui_hooks.main_window_did_init.append(self.on_startup)
+        # Collection is only guaranteed to be loaded once the profile is open
+        self._register_hook(gui_hooks.profile_did_open, self.on_startup)
         
-        # Timer cleanup to prevent macOS crash
+        # Release pooled connections when the profile closes
         try:
-            gui_hooks.profile_will_close.append(self._cleanup_timer)
+            self._register_hook(gui_hooks.profile_will_close, self._cleanup)
         except AttributeError:
-            gui_hooks.main_window_will_close.append(self._cleanup_timer)
+            self._register_hook(gui_hooks.main_window_will_close, self._cleanup)
+    
+    def _register_hook(self, hook, callback):
+        """Append callback once, replacing the copy an earlier instance registered on this hook"""
+        for registered_hook, registered in list(_registered_hooks):
+            if registered_hook is hook and registered.__name__ == callback.__name__:
+                hook.remove(registered)
+                _registered_hooks.remove((registered_hook, registered))
+        hook.append(callback)
+        _registered_hooks.append((hook, callback))
+    
+    def _get_review_data(self):
+        """Collect review data through the review collector"""
+        review_collector = self._get_collector('reviews')
+        if not review_collector:
+            return None
+        return review_collector.collect()
     
-    def _cleanup_timer(self):
-        """Clean up timer to prevent crash on quit"""
-        if self.startup_timer:
-            self.startup_timer.stop()
-            self.startup_timer = None
+    def _cleanup(self):
+        """Clean up pooled connections on quit"""
+        if self.api is not None:
+            self.api.close()
     
     def on_startup(self):
-        """Handle extension startup - called when Anki main window is ready"""
+        """Handle extension startup - called when the profile has been opened"""
         if self.startup_completed:
             return
         
@@ -142,79 +274,160 @@ class AnkiExtension:
             self.notifications.info("Configure server settings in Tools > Word Management Settings")
             return
         
-        # Perform startup operations after a short delay
-        self.startup_timer = QTimer()
-        self.startup_timer.setSingleShot(True)
-        self.startup_timer.timeout.connect(self.perform_startup_operations)
-        self.startup_timer.start(2000)
+        # Perform startup operations as soon as the event loop is idle; with mw as
+        # context the pending call is dropped if the window goes away first
+        QTimer.singleShot(0, mw, self.perform_startup_operations)
     
     def perform_startup_operations(self):
         """Perform auto-operations on startup"""
-        self.startup_timer = None
+        # Collection not ready yet - poll briefly instead of a fixed delay
+        if not mw.col:
+            QTimer.singleShot(50, mw, self.perform_startup_operations)
+            return
         
-        results = {
+        self.startup_results = {
             'imported': 0,
             'uploaded': 0,
             'errors': 0
         }
+        self.startup_pending = 0
         
-        try:
-            # Auto-import words if enabled
-            if self.config.get('auto_import_on_startup', True):
-                imported_count = self._auto_import_words()
-                results['imported'] = imported_count
-            
-            # Auto-upload cards if enabled
-            if self.config.get('auto_upload_on_startup', True):
-                uploaded_count = self._auto_upload_cards()
-                results['uploaded'] = uploaded_count
+        # Create shared objects here so both worker threads use the same instances
+        self._ensure_api()
+        self._ensure_collectors()
         
-        except Exception as e:
-            print(f"Startup operation error: {e}")
-            results['errors'] = 1
+        # Network requests run in the background and report back on the main thread.
+        # Imported words become cards, so the upload waits until the import dialog is done
+        auto_upload = self.config.get('auto_upload_on_startup', True)
+        if self.config.get('auto_import_on_startup', True):
+            self.startup_pending += 1
+            mw.taskman.run_in_background(
+                self._auto_import_words,
+                lambda future: self._on_words_fetched(future, auto_upload)
+            )
+        elif auto_upload:
+            self._auto_upload_cards()
+        
+        if not self.startup_pending:
+            self.notifications.startup_complete(self.startup_results)
+    
+    def _on_words_fetched(self, future, upload_after: bool = False):
+        """Show import dialog as soon as words arrive, then start the upload if enabled (main thread)"""
+        try:
+            self.startup_results['imported'] = self._show_import_dialog(future.result())
+        except Exception:
+            log.exception("Startup operation failed")
+            self.startup_results['errors'] += 1
         
-        # Show completion notification
-        self.notifications.startup_complete(results)
+        # Started before this task is finished, so the pending count never drops to zero in between
+        if upload_after:
+            self._auto_upload_cards()
+        self._finish_startup_task()
+    
+    def _on_cards_uploaded(self, future, fingerprint: str, card_count: int):
+        """Record upload result and remember the uploaded deck state (main thread)"""
+        try:
+            success, result = future.result()
+            if success:
+                self.config.set('last_upload_fingerprint', fingerprint)
+                self.startup_results['uploaded'] = card_count
+            else:
+                log.warning("Auto-upload failed: %s", result)
+                self._clear_upload_fingerprint()
+        except Exception:
+            log.exception("Startup operation failed")
+            self._clear_upload_fingerprint()
+            self.startup_results['errors'] += 1
+        self._finish_startup_task()
     
-    def _auto_import_words(self) -> int:
-        """Auto-import words on startup"""
+    def _finish_startup_task(self):
+        """Show completion notification once all startup tasks are done"""
+        self.startup_pending -= 1
+        if not self.startup_pending:
+            self.notifications.startup_complete(self.startup_results)
+    
+    def _auto_import_words(self) -> list:
+        """Fetch processed words on startup (runs off the main thread)"""
+        if not self.config.is_server_configured():
+            return []
+        
         try:
-            success, words = self.api.get_words()
+            success, words = self._ensure_api().get_words()
             if success and words:
-                dialog = ImportDialog(words, self.config, self.card_processor, self.api)
-                dialog.exec()
-                return len(words)
+                return words
+            return []
+        except Exception:
+            log.exception("Auto-import failed")
+            return []
+    
+    def _show_import_dialog(self, words: list) -> int:
+        """Show import dialog for fetched words (main thread only)"""
+        if not words:
             return 0
-        except Exception as e:
-            print(f"Auto-import error: {e}")
+        
+        try:
+            from .dialogs.import_dialog import ImportDialog
+            self._ensure_collectors()
+            dialog = ImportDialog(words, self.config, self.card_processor, self._ensure_api())
+            dialog.exec()
+            return len(words)
+        except Exception:
+            log.exception("Auto-import failed")
             return 0
     
-    def _auto_upload_cards(self) -> int:
-        """Auto-upload cards on startup"""
+    def _auto_upload_cards(self):
+        """Auto-upload cards on startup; the deck is read here, only the upload runs in the background"""
+        # Check before collecting so an unconfigured server never costs a deck scan
+        if not self.config.is_server_configured():
+            return
+        
         try:
-            card_collector = self.data_collector.get_collector('cards')
-            if card_collector:
-                deck_name = self.config.get('deck_name', 'Default')
-                card_collector.set_deck_name(deck_name)
-                
-                card_data = card_collector.collect()
-                cards = card_data.get('cards', [])
-                
-                if cards:
-                    self.api.clear_cards()
-                    success, result = self.api.upload_cards(cards)
-                    if success:
-                        return len(cards)
-            return 0
-        except Exception as e:
-            print(f"Auto-upload error: {e}")
-            return 0
+            card_collector = self._get_collector('cards')
+            if not card_collector:
+                return
+            
+            deck_name = self.config.get('deck_name', 'Default')
+            card_collector.set_deck_name(deck_name)
+            
+            # Skip extraction and upload when nothing changed since last upload
+            fingerprint = self._get_upload_fingerprint(card_collector)
+            if fingerprint == self.config.get('last_upload_fingerprint'):
+                return
+            
+            cards = card_collector.collect().get('cards', [])
+            if not cards:
+                return
+        except Exception:
+            log.exception("Auto-upload failed")
+            return
+        
+        api = self._ensure_api()
+        self.startup_pending += 1
+        mw.taskman.run_in_background(
+            lambda: api.replace_cards(cards),
+            lambda future: self._on_cards_uploaded(future, fingerprint, len(cards))
+        )
+    
+    def _get_upload_fingerprint(self, card_collector) -> str:
+        """Fingerprint of deck contents for the configured server"""
+        return f"{self.config.get('server_url')}|{card_collector.collect_fingerprint()}"
+    
+    def _clear_upload_fingerprint(self):
+        """Forget the last uploaded deck state so the next startup uploads again"""
+        self.config.set('last_upload_fingerprint', "")
     
     def show_settings(self):
         """Show settings dialog"""
         try:
-            dialog = SettingsDialog(self.config, self.api)
-            if dialog.exec():
+            if self._settings_dialog is None:
+                from .dialogs.settings import SettingsDialog
+                self._settings_dialog = SettingsDialog(self.config, self._ensure_api())
+            else:
+                # Reused dialog: show current values and any new decks
+                self._settings_dialog.refresh_decks()
+                self._settings_dialog.load_current_settings()
+            
+            if self._settings_dialog.exec():
                 self.config.reload()
                 self.notifications.success("Settings updated")
         except Exception as e:
@@ -227,7 +440,7 @@ class AnkiExtension:
                 showInfo("Please configure server settings first")
                 return
             
-            card_collector = self.data_collector.get_collector('cards')
+            card_collector = self._get_collector('cards')
             if not card_collector:
                 showInfo("Card collector not available")
                 return
@@ -235,6 +448,7 @@ class AnkiExtension:
             deck_name = self.config.get('deck_name', 'Default')
             card_collector.set_deck_name(deck_name)
             
+            fingerprint = self._get_upload_fingerprint(card_collector)
             card_data = card_collector.collect()
             cards = card_data.get('cards', [])
             
@@ -242,15 +456,31 @@ class AnkiExtension:
                 showInfo("No cards found in the specified deck")
                 return
             
-            self.api.clear_cards()
-            success, result = self.api.upload_cards(cards)
+            # Collection was read above on the main thread; only the HTTP upload runs in the background
+            api = self._ensure_api()
+            self.notifications.info(f"Uploading {len(cards)} cards...")
+            mw.taskman.run_in_background(
+                lambda: api.replace_cards(cards),
+                lambda future: self._on_manual_upload_done(future, fingerprint, len(cards))
+            )
+        
+        except Exception as e:
+            self.notifications.error(e, "Upload Error")
+    
+    def _on_manual_upload_done(self, future, fingerprint: str, card_count: int):
+        """Report manual upload result (main thread)"""
+        try:
+            success, result = future.result()
             
             if success:
-                self.notifications.success(f"Uploaded {len(cards)} cards")
+                self.config.set('last_upload_fingerprint', fingerprint)
+                self.notifications.success(f"Uploaded {card_count} cards")
             else:
+                self._clear_upload_fingerprint()
                 self.notifications.error(f"Upload failed: {result}")
         
         except Exception as e:
+            self._clear_upload_fingerprint()
             self.notifications.error(e, "Upload Error")
     
     def manual_import(self):
@@ -260,7 +490,18 @@ class AnkiExtension:
                 showInfo("Please configure server settings first")
                 return
             
-            success, words = self.api.get_words()
+            # Create shared objects on the main thread before the fetch starts
+            api = self._ensure_api()
+            self._ensure_collectors()
+            mw.taskman.run_in_background(api.get_words, self._on_manual_words_fetched)
+        
+        except Exception as e:
+            self.notifications.error(e, "Import Error")
+    
+    def _on_manual_words_fetched(self, future):
+        """Show import dialog for manually fetched words (main thread)"""
+        try:
+            success, words = future.result()
             
             if not success:
                 showInfo("Failed to get words from server")
@@ -270,7 +511,8 @@ class AnkiExtension:
                 showInfo("No processed words available on server")
                 return
             
-            dialog = ImportDialog(words, self.config, self.card_processor, self.api)
+            from .dialogs.import_dialog import ImportDialog
+            dialog = ImportDialog(words, self.config, self.card_processor, self._ensure_api())
             dialog.exec()
         
         except Exception as e:
@@ -280,13 +522,11 @@ class AnkiExtension:
         """View analytics data (simple display for now)"""
         try:
             # Collect review data
-            review_collector = self.data_collector.get_collector('reviews')
-            if not review_collector:
+            review_data = self._get_review_data()
+            if review_data is None:
                 showInfo("Review collector not available")
                 return
             
-            review_data = review_collector.collect()
-            
             # Check if data collection was successful
             if review_data.get('status') == 'error':
                 showInfo(f"Error collecting analytics data: {review_data.get('error', 'Unknown error')}")
@@ -345,13 +585,11 @@ class AnkiExtension:
         """Show raw analytics JSON data for debugging"""
         try:
             # Collect review data
-            review_collector = self.data_collector.get_collector('reviews')
-            if not review_collector:
+            review_data = self._get_review_data()
+            if review_data is None:
                 showInfo("Review collector not available")
                 return
             
-            review_data = review_collector.collect()
-            
             # Show JSON viewer dialog
             dialog = JSONViewerDialog(review_data, "Analytics JSON Data")
             dialog.exec()
@@ -367,13 +605,11 @@ class AnkiExtension:
                 return
             
             # Collect review data
-            review_collector = self.data_collector.get_collector('reviews')
-            if not review_collector:
+            review_data = self._get_review_data()
+            if review_data is None:
                 showInfo("Review collector not available")
                 return
             
-            review_data = review_collector.collect()
-            
             # Check if data collection was successful
             if review_data.get('status') == 'error':
                 showInfo(f"Error collecting analytics data: {review_data.get('error', 'Unknown error')}")
@@ -383,8 +619,20 @@ class AnkiExtension:
                 showInfo("No analytics data to send")
                 return
             
-            # Send to server
-            success, result = self.api.send_analytics_data(review_data)
+            # Send to server in the background
+            api = self._ensure_api()
+            mw.taskman.run_in_background(
+                lambda: api.send_analytics_data(review_data),
+                self._on_analytics_sent
+            )
+        
+        except Exception as e:
+            self.notifications.error(e, "Analytics Send Error")
+    
+    def _on_analytics_sent(self, future):
+        """Report analytics send result (main thread)"""
+        try:
+            success, result = future.result()
             
             if success:
                 self.notifications.success("Analytics data sent successfully")
@@ -1,80 +1,231 @@
 # api_client.py - Server Communication
+import gzip
 import json
-import requests
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from .utils import ensure_protocol
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode JSON request body, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+def _gzip_body(body: bytes) -> bytes:
+    """Compress a request body (low level: payloads are JSON, speed matters more)"""
+    return gzip.compress(body, compresslevel=3)
+
+def _json_loads(content: bytes) -> Any:
+    """Decode JSON response body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 class APIClient:
     """Simple HTTP client for server communication"""
     
     def __init__(self, config_manager):
         self.config = config_manager
-        self.timeout = 30
+        self.timeout = (3.05, 30)  # (connect, read)
+        self._session = None
+        self._requests = None  # requests module, set when the session is created
+        self._session_lock = threading.Lock()
+        self._session_api_key = None  # API key the session's auth header was built from
+    
+    @property
+    def session(self):
+        """Pooled session, created on first request"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self):
+        """Create a pooled keep-alive session shared by all requests"""
+        # Imported here so loading the add-on does not pull in requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        self._requests = requests
+        session = requests.Session()
+        session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        })
+        
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    def close(self) -> None:
+        """Close pooled connections"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+            self._session_api_key = None
     
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authentication"""
         return {
-            "Authorization": f"Bearer {self.config.get('api_key')}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Authorization": f"Bearer {self.config.get('api_key')}"
         }
     
+    def _sync_session_headers(self, session) -> None:
+        """Refresh the session's auth header only when the API key changed"""
+        api_key = self.config.get('api_key')
+        if api_key != self._session_api_key:
+            session.headers.update(self._get_headers())
+            self._session_api_key = api_key
+    
     def _get_base_url(self) -> str:
         """Get base server URL"""
         url = self.config.get('server_url')
         return ensure_protocol(url, 'http')
     
-    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Tuple[bool, Any]:
-        """Make HTTP request to server"""
+    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, body: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None, base_url: Optional[str] = None) -> Tuple[bool, Any]:
+        """Make HTTP request to server (pass pre-encoded JSON as body to skip re-encoding)"""
         try:
-            url = f"{self._get_base_url()}{endpoint}"
-            headers = self._get_headers()
+            url = f"{base_url or self._get_base_url()}{endpoint}"
+            session = self.session
+            self._sync_session_headers(session)
             
-            response = requests.request(
+            if body is None and data is not None:
+                body = _json_dumps(data)
+            
+            response = session.request(
                 method=method,
                 url=url,
+                data=body,
                 headers=headers,
-                json=data,
                 timeout=self.timeout
             )
             
             if response.status_code == 200:
                 try:
-                    return True, response.json()
-                except json.JSONDecodeError:
+                    return True, _json_loads(response.content)
+                except ValueError:
                     return True, response.text
             else:
                 error_msg = f"HTTP {response.status_code}"
                 try:
-                    error_data = response.json()
+                    error_data = _json_loads(response.content)
                     if 'detail' in error_data:
                         error_msg = error_data['detail']
-                except:
+                except (ValueError, TypeError):
                     error_msg = f"HTTP {response.status_code}: {response.text}"
                 return False, error_msg
                 
-        except requests.exceptions.Timeout:
-            return False, "Request timeout - server took too long to respond"
-        except requests.exceptions.ConnectionError:
-            return False, "Cannot connect to server - check URL and network"
         except Exception as e:
-            return False, str(e)
+            return False, self._describe_error(e)
+    
+    def _describe_error(self, error: Exception) -> str:
+        """User-facing message for a failed request"""
+        # requests is only imported with the session; errors raised before that are reported as-is
+        if self._requests is not None:
+            if isinstance(error, self._requests.exceptions.Timeout):
+                return "Request timeout - server took too long to respond"
+            if isinstance(error, self._requests.exceptions.ConnectionError):
+                return "Cannot connect to server - check URL and network"
+        return str(error)
     
-    def test_connection(self) -> Tuple[bool, str]:
-        """Test server connection"""
-        success, result = self._request("GET", "/")
+    def test_connection(self, server_url: Optional[str] = None, api_key: Optional[str] = None) -> Tuple[bool, str]:
+        """Test server connection, optionally with unsaved URL/key instead of the configured ones"""
+        base_url = ensure_protocol(server_url, 'http') if server_url else None
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+        success, result = self._request("GET", "/", headers=headers, base_url=base_url)
         if success:
             return True, "Connection successful"
         else:
             return False, f"Connection failed: {result}"
     
-    def upload_cards(self, cards: List[Dict]) -> Tuple[bool, Any]:
-        """Upload cards to server"""
+    def upload_cards(self, cards: List[Dict], batch_size: int = 200, replace: bool = False,
+                     max_in_flight: int = 4) -> Tuple[bool, Any]:
+        """Upload cards to server in fixed-size batches (replace=True swaps the whole set atomically)"""
+        total = len(cards)
+        
+        if replace:
+            if total > batch_size:
+                return self._replace_in_batches(cards, batch_size, max_in_flight)
+            
+            # A small deck is replaced in one request and one server transaction
+            success, result = self._post_cards("/api/v1/anki/cards/replace", cards)
+            if not success:
+                return False, result
+            return True, {"message": f"Replaced server cards with {total} cards", "cards_received": total}
+        
         if not cards:
             return True, {"message": "No cards to upload", "cards_received": 0}
         
-        success, result = self._request("POST", "/api/v1/anki/cards", {"cards": cards})
-        return success, result
+        uploaded, error = self._post_batches("/api/v1/anki/cards", cards, batch_size, max_in_flight)
+        if error is not None:
+            # Report partial progress
+            return False, f"{error} (uploaded {uploaded} of {total} cards)"
+        
+        return True, {"message": f"Uploaded {uploaded} of {total} cards", "cards_received": uploaded}
+    
+    def _post_batches(self, endpoint: str, cards: List[Dict], batch_size: int,
+                      max_in_flight: int) -> Tuple[int, Optional[str]]:
+        """POST cards in batches, a few in flight at once; returns (cards sent, first error)"""
+        uploaded = 0
+        error = None
+        batches = [cards[start:start + batch_size] for start in range(0, len(cards), batch_size)]
+        
+        # Each body is encoded only when its upload starts
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(batches))) as executor:
+            results = executor.map(lambda batch: self._post_cards(endpoint, batch), batches)
+            for batch, (success, result) in zip(batches, results):
+                if success:
+                    uploaded += len(batch)
+                elif error is None:
+                    error = result
+        
+        return uploaded, error
+    
+    def _replace_in_batches(self, cards: List[Dict], batch_size: int, max_in_flight: int) -> Tuple[bool, Any]:
+        """Stage cards on the server in parallel batches, then swap them in with one commit request"""
+        total = len(cards)
+        staging = f"/api/v1/anki/cards/replace/{uuid.uuid4().hex}"
+        
+        # Server cards stay untouched until the commit, so a failed batch leaves no truncated set
+        staged, error = self._post_batches(f"{staging}/batch", cards, batch_size, max_in_flight)
+        if error is not None:
+            self._request("DELETE", staging)
+            return False, f"{error} (staged {staged} of {total} cards, server cards unchanged)"
+        
+        success, result = self._request("POST", f"{staging}/commit")
+        if not success:
+            self._request("DELETE", staging)
+            return False, result
+        
+        return True, {"message": f"Replaced server cards with {total} cards", "cards_received": total}
+    
+    def _post_cards(self, endpoint: str, batch: List[Dict]) -> Tuple[bool, Any]:
+        """POST one batch of cards"""
+        return self._request("POST", endpoint, body=_json_dumps({"cards": batch}))
+    
+    def replace_cards(self, cards: List[Dict]) -> Tuple[bool, Any]:
+        """Replace all server cards with the given cards, saving a separate clear request"""
+        return self.upload_cards(cards, replace=True)
     
     def clear_cards(self) -> Tuple[bool, Any]:
         """Clear all cards from server"""
@@ -96,8 +247,16 @@ class APIClient:
     
     def send_analytics_data(self, analytics_data: Dict) -> Tuple[bool, Any]:
         """Send analytics data to server"""
-        success, result = self._request("POST", "/api/v1/analytics/data", analytics_data)
-        return success, result
+        # Note: the bundled API does not serve /analytics yet; compression only
+        # takes effect once a server exposes this route
+        body = _json_dumps(analytics_data)
+        
+        # Session history can get large; compress it unless it is tiny
+        if len(body) < 1024:
+            return self._request("POST", "/api/v1/analytics/data", body=body)
+        
+        return self._request("POST", "/api/v1/analytics/data", body=_gzip_body(body),
+                             headers={"Content-Encoding": "gzip"})
     
     def get_analytics_dashboard(self) -> Tuple[bool, Any]:
         """Get analytics dashboard data from server"""
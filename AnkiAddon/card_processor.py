@@ -1,13 +1,56 @@
 # card_processor.py - Card Data Processing
+import hashlib
+import logging
 from typing import List, Dict, Tuple
 from aqt import mw
+from aqt.qt import QTimer
 from .utils import clean_html, color_german_word
 
+log = logging.getLogger(__name__)
+
+_reset_pending = False
+
+def _schedule_reset():
+    """Coalesce collection save and main window reset into one per event loop turn"""
+    global _reset_pending
+    if _reset_pending:
+        return
+    _reset_pending = True
+    QTimer.singleShot(0, _do_reset)
+
+def _do_reset():
+    """Save collection and refresh main window after imports"""
+    global _reset_pending
+    _reset_pending = False
+    if mw.col:
+        mw.col.save()
+    mw.reset()
+
 class CardProcessor:
     """Handles card extraction and creation operations"""
     
+    # Uploaded card keys and the note fields they are read from
+    CARD_FIELDS = (
+        ("tl_word", "TL Word"),
+        ("tl_sentence", "TL Sentence"),
+        ("nl_word", "NL Word"),
+        ("nl_sentence", "NL Sentence"),
+    )
+    
+    # Note fields filled from imported word data, with how each value is derived
+    WORD_FIELDS = (
+        ("TL Word", lambda word: color_german_word(word.get('original_word', ''))),
+        ("TL Sentence", lambda word: word.get('tl_sentence', '')),
+        ("NL Word", lambda word: word.get('nl_word', '')),
+        ("NL Sentence", lambda word: word.get('nl_sentence', '')),
+        ("TL Plural", lambda word: word.get('tl_plural', '') or ''),
+    )
+    
+    # Compatible note type found by the last scan, revalidated by its mod time
+    _note_type_cache = {"id": None, "mod": None, "field_ords": None}
+    
     def __init__(self):
-        pass
+        self._next_id_cache = (None, None)  # (notes table version, next available ID)
     
     def extract_cards_from_deck(self, deck_name: str) -> List[Dict]:
         """Extract cards from specified Anki deck"""
@@ -16,76 +59,118 @@ class CardProcessor:
         
         try:
             deck_id = mw.col.decks.id(deck_name)
-            card_ids = mw.col.decks.cids(deck_id)
-            unique_cards = {}
             
-            for card_id in card_ids:
-                try:
-                    note = mw.col.getCard(card_id).note()
-                    fields = dict(zip(note.keys(), note.values()))
-                    
-                    # Get card ID, skip if empty or duplicate
-                    card_id_val = fields.get('ID', '').strip()
-                    if not card_id_val or card_id_val in unique_cards:
-                        continue
-                    
-                    # Extract and clean card data
-                    unique_cards[card_id_val] = {
-                        "card_id": card_id_val,
-                        "tl_word": clean_html(fields.get('TL Word', '')),
-                        "tl_sentence": clean_html(fields.get('TL Sentence', '')),
-                        "nl_word": clean_html(fields.get('NL Word', '')),
-                        "nl_sentence": clean_html(fields.get('NL Sentence', ''))
-                    }
-                except Exception as e:
-                    print(f"Error processing card {card_id}: {e}")
+            # Read raw fields of every note in the deck with a single query
+            rows = mw.col.db.all("""
+                SELECT mid, flds FROM notes
+                WHERE id IN (SELECT nid FROM cards WHERE did = ?)
+                ORDER BY id
+            """, deck_id)
+            
+            note_type_ords = {}  # note type id -> (ID ordinal, [(card key, ordinal)])
+            seen_ids = set()
+            cards = []
+            
+            for mid, flds in rows:
+                if mid not in note_type_ords:
+                    note_type_ords[mid] = self._get_card_field_ords(mid)
+                id_ord, value_ords = note_type_ords[mid]
+                if id_ord is None:
+                    continue
+                
+                fields = flds.split('\x1f')
+                if id_ord >= len(fields):
+                    continue
+                
+                # Get card ID, skip if empty or duplicate
+                card_id_val = fields[id_ord].strip()
+                if not card_id_val or card_id_val in seen_ids:
                     continue
+                seen_ids.add(card_id_val)
+                
+                # Extract and clean card data
+                card = {"card_id": card_id_val}
+                for key, field_ord in value_ords:
+                    card[key] = "" if field_ord is None or field_ord >= len(fields) else clean_html(fields[field_ord])
+                cards.append(card)
             
-            return list(unique_cards.values())
+            return cards
             
         except Exception as e:
-            print(f"Error extracting cards from deck '{deck_name}': {e}")
+            log.error("Error extracting cards from deck '%s': %s", deck_name, e)
             return []
     
+    def get_deck_fingerprint(self, deck_name: str) -> str:
+        """Get a cheap digest of the deck's notes (ids and mod times) to detect changes"""
+        if not mw.col:
+            return ""
+        
+        deck_id = mw.col.decks.id(deck_name)
+        rows = mw.col.db.all("""
+            SELECT id, mod FROM notes
+            WHERE id IN (SELECT nid FROM cards WHERE did = ?)
+            ORDER BY id
+        """, deck_id)
+        
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(deck_id).encode())
+        for note_id, mod in rows:
+            digest.update(f"{note_id}:{mod};".encode())
+        return digest.hexdigest()
+    
+    def _get_card_field_ords(self, mid: int) -> Tuple:
+        """Get ID ordinal and uploaded field ordinals for a note type"""
+        model = mw.col.models.get(mid)
+        if not model:
+            return None, []
+        
+        field_ords = self._get_field_ords(model)
+        return field_ords.get('ID'), [(key, field_ords.get(name)) for key, name in self.CARD_FIELDS]
+    
     def get_next_available_id(self) -> int:
         """Get next available card ID"""
         if not mw.col:
             return 1
         
         try:
-            # Search for notes with ID field
-            note_ids = mw.col.find_notes('"ID:*"')
-            if not note_ids:
-                note_ids = mw.col.find_notes('ID:*')
+            # Reuse the last result while the notes table is unchanged
+            version = self._get_notes_version()
+            cached_version, cached_id = self._next_id_cache
+            if cached_version == version:
+                return cached_id
             
             max_id = 0
             
-            for note_id in note_ids:
-                try:
-                    note = mw.col.get_note(note_id)
-                    
-                    # Try to get ID field value
-                    id_value = ""
-                    if hasattr(note, '__getitem__') and 'ID' in note:
-                        id_value = note['ID']
-                    else:
-                        # Alternative method
-                        fields_dict = dict(zip(note.keys(), note.values()))
-                        id_value = fields_dict.get('ID', '')
+            # Read raw field strings straight from the notes table, one query per note type
+            for model in mw.col.models.all():
+                id_ord = self._get_field_ords(model).get('ID')
+                if id_ord is None:
+                    continue
+                
+                for flds in mw.col.db.list("SELECT flds FROM notes WHERE mid = ?", model['id']):
+                    fields = flds.split('\x1f')
+                    if id_ord >= len(fields):
+                        continue
                     
-                    id_value = id_value.strip()
-                    if id_value and id_value.isdigit():
+                    id_value = fields[id_ord].strip()
+                    if id_value.isdigit():
                         max_id = max(max_id, int(id_value))
-                        
-                except Exception as e:
-                    continue
             
+            self._next_id_cache = (version, max_id + 1)
             return max_id + 1
             
         except Exception as e:
-            print(f"Error getting next ID: {e}")
+            log.error("Error getting next ID: %s", e)
             return 1
     
+    def _get_notes_version(self) -> Tuple:
+        """Cheap change marker for the notes table (count and newest mod time)"""
+        return tuple(mw.col.db.first("SELECT COUNT(*), MAX(mod) FROM notes"))
+    
+    def _get_field_ords(self, model) -> Dict[str, int]:
+        """Map field names of a note type to their ordinals in note.fields"""
+        return {field['name']: field['ord'] for field in model['flds']}
+    
     def create_cards_from_words(self, words: List[Dict], deck_name: str) -> Tuple[int, int]:
         """Create Anki cards from word data"""
         if not words or not mw.col:
@@ -97,66 +182,104 @@ class CardProcessor:
             # Find note type with ID field
             note_type = self._find_compatible_note_type()
             if not note_type:
-                print("No compatible note type found with ID field")
+                log.warning("No compatible note type found with ID field")
                 return 0, len(words)
             
+            # Field ordinals are resolved once per note type, not per note
+            field_ords = self._note_type_cache["field_ords"]
+            field_count = len(note_type['flds'])
+            
             # Get starting ID
             starting_id = self.get_next_available_id()
             created_count = 0
             
+            # Loop-invariant parts of the field list: constant values and which
+            # word fields map to which ordinals in this note type
+            template = [""] * field_count
+            if 'Add Reverse' in field_ords:
+                template[field_ords['Add Reverse']] = 'y'
+            id_ord = field_ords['ID']
+            word_ords = [
+                (field_ords[name], getter) for name, getter in self.WORD_FIELDS
+                if name in field_ords
+            ]
+            
+            notes = []
+            new_note = mw.col.new_note
             for i, word in enumerate(words):
-                try:
-                    note = mw.col.new_note(note_type)
-                    new_id = starting_id + i
-                    
-                    # Set card fields
-                    field_mapping = {
-                        'ID': str(new_id),
-                        'TL Word': color_german_word(word.get('original_word', '')),
-                        'TL Sentence': word.get('tl_sentence', ''),
-                        'NL Word': word.get('nl_word', ''),
-                        'NL Sentence': word.get('nl_sentence', ''),
-                        'TL Plural': word.get('tl_plural', '') or '',
-                        'Add Reverse': 'y'
-                    }
-                    
-                    # Set fields with error handling
-                    for field_name, value in field_mapping.items():
-                        try:
-                            if field_name in note:
-                                note[field_name] = value
-                        except Exception as e:
-                            print(f"Error setting field {field_name}: {e}")
-                            continue
-                    
-                    # Add note to collection
-                    mw.col.add_note(note, deck_id)
-                    created_count += 1
-                    
-                except Exception as e:
-                    print(f"Error creating card for word '{word.get('original_word', 'unknown')}': {e}")
-                    continue
+                note = new_note(note_type)
+                
+                # Build the full field list by ordinal and assign it in one go
+                fields = template.copy()
+                fields[id_ord] = str(starting_id + i)
+                for field_ord, getter in word_ords:
+                    fields[field_ord] = getter(word)
+                note.fields = fields
+                notes.append((word, note))
             
-            # Save changes
+            created_count = self._add_notes(notes, deck_id)
+            
+            # IDs were handed out locally; remember the next one instead of rescanning
+            if created_count > 0:
+                self._next_id_cache = (self._get_notes_version(), starting_id + len(words))
+            
+            # Save changes once after all imports queued in this event loop turn
             if created_count > 0:
-                mw.col.save()
-                mw.reset()
+                _schedule_reset()
             
             return created_count, len(words) - created_count
             
         except Exception as e:
-            print(f"Error creating cards: {e}")
+            log.error("Error creating cards: %s", e)
             return 0, len(words)
     
+    def _add_notes(self, notes: List[Tuple[Dict, object]], deck_id: int) -> int:
+        """Add (word, note) pairs to the collection, returning how many were added"""
+        # Newer Anki versions can insert every note in a single backend call
+        if hasattr(mw.col, 'add_notes'):
+            try:
+                from anki.collection import AddNoteRequest
+                mw.col.add_notes([AddNoteRequest(note=note, deck_id=deck_id) for _, note in notes])
+                return len(notes)
+            except Exception as e:
+                # The bulk call is all-or-nothing; retry per note to isolate bad words
+                log.warning("Bulk note insert failed, adding notes individually: %s", e)
+        
+        failed = []  # (word, error) pairs, reported once after the loop
+        add_note = mw.col.add_note
+        for word, note in notes:
+            # Add note to collection; only this call can reject a single word
+            try:
+                add_note(note, deck_id)
+            except Exception as e:
+                failed.append((word.get('original_word', 'unknown'), e))
+        
+        if failed:
+            first_word, first_error = failed[0]
+            log.error("Failed to create %s of %s cards (first: '%s': %s)", len(failed), len(notes), first_word, first_error)
+        
+        return len(notes) - len(failed)
+    
     def _find_compatible_note_type(self):
         """Find note type with ID field"""
         try:
-            models = mw.col.models.all()
-            for model in models:
-                field_names = [field['name'] for field in model['flds']]
-                if 'ID' in field_names:
+            cache = CardProcessor._note_type_cache
+            
+            # Reuse the cached note type while it is unchanged
+            if cache["id"] is not None:
+                model = mw.col.models.get(cache["id"])
+                if model and model['mod'] == cache["mod"]:
                     return model
+            
+            for entry in mw.col.models.all_names_and_ids():
+                model = mw.col.models.get(entry.id)
+                # Short-circuit scan; only the matching model gets its ordinal map built
+                if any(field['name'] == 'ID' for field in model['flds']):
+                    cache.update(id=model['id'], mod=model['mod'], field_ords=self._get_field_ords(model))
+                    return model
+            
+            cache.update(id=None, mod=None, field_ords=None)
             return None
         except Exception as e:
-            print(f"Error finding note type: {e}")
+            log.error("Error finding note type: %s", e)
             return None
\ No newline at end of file
@@ -1,4 +1,5 @@
 # config.py - Rewritten Configuration Management
+from types import MappingProxyType
 from aqt import mw
 
 class ConfigManager:
@@ -14,42 +15,92 @@ class ConfigManager:
         "collect_reviews": True,
         "collect_decks": False,
         "collect_patterns": False,
+        "last_upload_fingerprint": "",  # Deck state last uploaded; cleared when the server changes
     }
     
+    # Settings that identify the server; changing any of them invalidates the upload fingerprint
+    SERVER_KEYS = ("server_url", "api_key")
+    
     def __init__(self):
+        self._cache = None  # Stored config, read once until reload()
+        self._merged = {}  # Defaults overlaid with the stored config
+        self._server_configured = False  # Derived flags, refreshed with the cache
+        self._enabled_collectors = ()
         self._ensure_config_exists()
+        
+        # Drop the cache when the config is edited from Anki's add-on manager
+        mw.addonManager.setConfigUpdatedAction(__name__, self._on_config_updated)
+    
+    def _on_config_updated(self, config: dict):
+        """Config edited from Anki's add-on manager"""
+        stored = self._cache
+        if stored is not None and any(stored.get(key) != config.get(key) for key in self.SERVER_KEYS):
+            # New server may not have the cards; the edited dict is what gets stored
+            config["last_upload_fingerprint"] = ""
+            self._write(config)
+        self.reload()
+    
+    def _load(self) -> dict:
+        """Get stored configuration, reading it from Anki only once"""
+        if self._cache is None:
+            self._set_cache(mw.addonManager.getConfig(__name__) or {})
+        return self._cache
+    
+    def _write(self, config: dict):
+        """Write configuration to Anki and keep the cache in sync"""
+        self._set_cache(config)
+        mw.addonManager.writeConfig(__name__, config)
+    
+    def _set_cache(self, config: dict):
+        """Cache configuration and precompute flags derived from it"""
+        self._cache = config
+        self._merged = merged = {**self.DEFAULT_CONFIG, **config}
+        self._server_configured = bool(merged['server_url'] and merged['api_key'])
+        self._enabled_collectors = tuple(
+            key[len('collect_'):] for key, value in merged.items()
+            if key.startswith('collect_') and value
+        )
     
     def _ensure_config_exists(self):
         """Ensure configuration exists with defaults"""
-        current = mw.addonManager.getConfig(__name__)
-        if not current:
-            mw.addonManager.writeConfig(__name__, self.DEFAULT_CONFIG.copy())
+        if not self._load():
+            self._write(self.DEFAULT_CONFIG.copy())
     
     def get(self, key: str, default=None):
         """Get configuration value"""
-        config = mw.addonManager.getConfig(__name__) or {}
-        if key in config:
-            return config[key]
-        return self.DEFAULT_CONFIG.get(key, default)
-    
-    def set(self, key: str, value):
-        """Set configuration value"""
-        config = mw.addonManager.getConfig(__name__) or {}
+        self._load()
+        return self._merged.get(key, default)
+    
+    def set(self, key: str, value) -> bool:
+        """Set configuration value, returning False when it was already stored"""
+        config = self._load()
+        if key in config and config[key] == value:
+            return False
         config[key] = value
-        mw.addonManager.writeConfig(__name__, config)
+        if key in self.SERVER_KEYS:
+            config["last_upload_fingerprint"] = ""
+        self._write(config)
+        return True
     
     def get_all(self):
-        """Get all configuration values"""
-        config = mw.addonManager.getConfig(__name__) or {}
-        result = self.DEFAULT_CONFIG.copy()
-        result.update(config)
-        return result
-    
-    def update(self, updates: dict):
-        """Update multiple configuration values"""
-        config = mw.addonManager.getConfig(__name__) or {}
-        config.update(updates)
-        mw.addonManager.writeConfig(__name__, config)
+        """Get all configuration values (read-only view)"""
+        self._load()
+        return MappingProxyType(self._merged)
+    
+    def update(self, updates: dict) -> bool:
+        """Update multiple configuration values, writing only if something changed"""
+        config = self._load()
+        changed = {
+            key: value for key, value in updates.items()
+            if key not in config or config[key] != value
+        }
+        if not changed:
+            return False
+        if any(key in changed for key in self.SERVER_KEYS):
+            changed["last_upload_fingerprint"] = ""
+        config.update(changed)
+        self._write(config)
+        return True
     
     def save(self):
         """Save is handled automatically by set/update methods"""
@@ -57,8 +108,14 @@ class ConfigManager:
     
     def is_server_configured(self):
         """Check if server is properly configured"""
-        return bool(self.get('server_url') and self.get('api_key'))
+        self._load()
+        return self._server_configured
+    
+    def get_enabled_collectors(self) -> tuple:
+        """Names of data collectors enabled via collect_* settings"""
+        self._load()
+        return self._enabled_collectors
     
     def reload(self):
-        """Reload configuration (no-op since we read fresh each time)"""
-        pass
\ No newline at end of file
+        """Reload configuration from Anki on next access"""
+        self._cache = None
\ No newline at end of file
@@ -1,33 +1,30 @@
 # data_collector.py - Flexible Data Collection System
-from typing import List, Dict, Any
+import logging
+from typing import List, Dict, Any, Callable
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
 class BaseDataCollector(ABC):
     """Base class for data collectors"""
     
+    name: str = ""  # Collector name, set by each subclass
+    
     @abstractmethod
     def collect(self) -> Dict[str, Any]:
         """Collect data and return as dictionary"""
         pass
-    
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Return collector name"""
-        pass
 
 class CardDataCollector(BaseDataCollector):
     """Collector for card data"""
     
+    name = "cards"
+    
     def __init__(self, card_processor):
         self.card_processor = card_processor
         self.deck_name = None
     
-    @property
-    def name(self) -> str:
-        return "cards"
-    
     def collect(self) -> Dict[str, Any]:
         """Collect current card data from deck"""
         if not self.deck_name:
@@ -41,9 +38,15 @@ class CardDataCollector(BaseDataCollector):
                 "deck_name": self.deck_name
             }
         except Exception as e:
-            print(f"Error collecting cards: {e}")
+            log.error("Error collecting cards: %s", e)
             return {"cards": [], "error": str(e)}
     
+    def collect_fingerprint(self) -> str:
+        """Get a digest of the deck contents without extracting card fields"""
+        if not self.deck_name:
+            return ""
+        return self.card_processor.get_deck_fingerprint(self.deck_name)
+    
     def set_deck_name(self, deck_name: str):
         """Set the deck to collect cards from"""
         self.deck_name = deck_name
@@ -51,14 +54,12 @@ class CardDataCollector(BaseDataCollector):
 class ReviewDataCollector(BaseDataCollector):
     """Collector for review statistics and analytics"""
     
+    name = "reviews"
+    
     def __init__(self, review_processor, config_manager):
         self.review_processor = review_processor
         self.config = config_manager
     
-    @property
-    def name(self) -> str:
-        return "reviews"
-    
     def collect(self) -> Dict[str, Any]:
         """Collect review data from Anki's existing data"""
         try:
@@ -76,7 +77,7 @@ class ReviewDataCollector(BaseDataCollector):
                 "status": "success"
             }
         except Exception as e:
-            print(f"Error collecting review data: {e}")
+            log.error("Error collecting review data: %s", e)
             return {
                 "latest_session": None,
                 "current_state": {},
@@ -91,9 +92,7 @@ class ReviewDataCollector(BaseDataCollector):
 class DeckDataCollector(BaseDataCollector):
     """Collector for deck metadata (future implementation)"""
     
-    @property
-    def name(self) -> str:
-        return "decks"
+    name = "decks"
     
     def collect(self) -> Dict[str, Any]:
         """Collect deck metadata"""
@@ -111,9 +110,7 @@ class DeckDataCollector(BaseDataCollector):
 class StudyPatternCollector(BaseDataCollector):
     """Collector for study patterns (future implementation)"""
     
-    @property
-    def name(self) -> str:
-        return "patterns"
+    name = "patterns"
     
     def collect(self) -> Dict[str, Any]:
         """Collect study patterns"""
@@ -133,25 +130,37 @@ class DataCollector:
     
     def __init__(self):
         self.collectors = {}
+        self._factories = {}  # name -> callable building the collector on first use
     
     def register_collector(self, collector: BaseDataCollector) -> None:
         """Register a data collector"""
         self.collectors[collector.name] = collector
-        print(f"Registered data collector: {collector.name}")
+        log.debug("Registered data collector: %s", collector.name)
+    
+    def register_factory(self, name: str, factory: Callable[[], BaseDataCollector]) -> None:
+        """Register a collector that is only constructed when first requested"""
+        self._factories[name] = factory
     
     def unregister_collector(self, name: str) -> None:
         """Remove a data collector"""
+        self._factories.pop(name, None)
         if name in self.collectors:
             del self.collectors[name]
-            print(f"Unregistered data collector: {name}")
+            log.debug("Unregistered data collector: %s", name)
     
     def get_collector(self, name: str) -> BaseDataCollector:
-        """Get a specific collector"""
-        return self.collectors.get(name)
+        """Get a specific collector, building it from its factory if needed"""
+        collector = self.collectors.get(name)
+        if collector is None and name in self._factories:
+            # Keep the factory until it succeeds so a failed build can be retried
+            collector = self._factories[name]()
+            self.register_collector(collector)
+            del self._factories[name]
+        return collector
     
     def list_collectors(self) -> list:
         """List all registered collectors"""
-        return list(self.collectors.keys())
+        return list(self.collectors.keys()) + list(self._factories.keys())
     
     def collect_enabled_data(self, config_manager) -> Dict[str, Any]:
         """Collect data from all enabled collectors"""
@@ -159,41 +168,35 @@ class DataCollector:
         collected_data = {}
         
         for collector_name in enabled_collectors:
-            if collector_name in self.collectors:
+            if collector_name in self.collectors or collector_name in self._factories:
                 try:
-                    collector = self.collectors[collector_name]
+                    collector = self.get_collector(collector_name)
                     data = collector.collect()
                     collected_data[collector_name] = data
-                    print(f"Collected data from {collector_name}")
+                    log.debug("Collected data from %s", collector_name)
                 except Exception as e:
-                    print(f"Failed to collect data from {collector_name}: {e}")
+                    log.error("Failed to collect data from %s: %s", collector_name, e)
                     collected_data[collector_name] = {"error": str(e)}
         
         return collected_data
     
     def get_enabled_collectors(self, config_manager) -> List[str]:
         """Get list of enabled collectors from config"""
-        enabled = []
-        if config_manager.get('collect_cards', True):
-            enabled.append('cards')
-        if config_manager.get('collect_reviews', True):
-            enabled.append('reviews')
-        if config_manager.get('collect_decks', False):
-            enabled.append('decks')
-        if config_manager.get('collect_patterns', False):
-            enabled.append('patterns')
-        return enabled
+        return list(config_manager.get_enabled_collectors())
     
     def collect_all_data(self) -> Dict[str, Any]:
         """Collect data from all collectors (regardless of config)"""
         collected_data = {}
         
+        for name in list(self._factories):
+            self.get_collector(name)
+        
         for name, collector in self.collectors.items():
             try:
                 data = collector.collect()
                 collected_data[name] = data
             except Exception as e:
-                print(f"Failed to collect data from {name}: {e}")
+                log.error("Failed to collect data from %s: %s", name, e)
                 collected_data[name] = {"error": str(e)}
         
         return collected_data
\ No newline at end of file
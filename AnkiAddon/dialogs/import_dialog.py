@@ -1,16 +1,108 @@
 # dialogs/import_dialog.py - Word Import Dialog
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QTableWidget, QTableWidgetItem, QCheckBox, QMessageBox,
-    QHeaderView
+    QTableView, QMessageBox, QHeaderView
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from aqt import mw
+from itertools import compress
 from typing import List, Dict
 
+class WordTableModel(QAbstractTableModel):
+    """Table model reading straight from the word list"""
+    
+    HEADERS = ["✓", "German Word", "English Word", "German Sentence", "English Sentence", "Plural"]
+    FIELDS = ['original_word', 'nl_word', 'tl_sentence', 'nl_sentence', 'tl_plural']
+    
+    # Item flags are the same for every cell of a column, so combine them once
+    CHECK_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+    EDIT_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+    
+    def __init__(self, words: List[Dict], parent=None):
+        super().__init__(parent)
+        self.words = words
+        # Column-major storage: one list of display strings per field
+        self.columns = [[str(word.get(field, '')) for word in words] for field in self.FIELDS]
+        self.checked = [True] * len(words)  # Select all by default
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.words)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row, col = index.row(), index.column()
+        if col == 0:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self.checked[row] else Qt.CheckState.Unchecked
+            return None
+        
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.columns[col - 1][row]
+        return None
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        
+        row, col = index.row(), index.column()
+        if col == 0 and role == Qt.ItemDataRole.CheckStateRole:
+            self.checked[row] = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif col > 0 and role == Qt.ItemDataRole.EditRole:
+            self.columns[col - 1][row] = str(value)
+        else:
+            return False
+        
+        self.dataChanged.emit(index, index, [role])
+        return True
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return self.CHECK_FLAGS if index.column() == 0 else self.EDIT_FLAGS
+    
+    def long_text_rows(self, limit: int) -> List[int]:
+        """Rows whose sentence columns are long enough to wrap"""
+        return [
+            row for row, (tl_sentence, nl_sentence) in enumerate(zip(self.columns[2], self.columns[3]))
+            if len(tl_sentence) > limit or len(nl_sentence) > limit
+        ]
+    
+    def set_all_checked(self, checked: bool):
+        """Check or uncheck every row"""
+        if not self.words:
+            return
+        self.checked = [checked] * len(self.words)
+        self.dataChanged.emit(
+            self.index(0, 0),
+            self.index(len(self.words) - 1, 0),
+            [Qt.ItemDataRole.CheckStateRole]
+        )
+    
+    def get_selected_words(self) -> List[Dict]:
+        """Get checked rows as word dicts, including any edits"""
+        selected = []
+        # zip(*columns) yields each row's values as one tuple; compress keeps checked rows
+        for word, values in compress(zip(self.words, zip(*self.columns)), self.checked):
+            word_data = dict(zip(self.FIELDS, values))
+            word_data['id'] = word.get('id', '')  # Keep original ID
+            selected.append(word_data)
+        return selected
+
 class ImportDialog(QDialog):
     """Simple dialog for importing processed words"""
     
+    WRAP_THRESHOLD = 60  # Sentence length (chars) above which a row is measured
+    
     def __init__(self, words: List[Dict], config_manager, card_processor, api_client):
         super().__init__(mw)
         self.words = words
@@ -25,10 +117,6 @@ class ImportDialog(QDialog):
         
         self.setup_ui()
         self.populate_table()
-
-    def closeEvent(self, event):
-        """Ensure proper cleanup on close"""
-        super().closeEvent(event)
     
     def setup_ui(self):
         """Setup the user interface"""
@@ -56,11 +144,9 @@ class ImportDialog(QDialog):
         layout.addLayout(select_layout)
         
         # Words table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "✓", "German Word", "English Word", "German Sentence", "English Sentence", "Plural"
-        ])
+        self.model = WordTableModel(self.words, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         
         # Set column widths
         header = self.table.horizontalHeader()
@@ -100,57 +186,27 @@ class ImportDialog(QDialog):
     
     def populate_table(self):
         """Populate table with word data"""
-        self.table.setRowCount(len(self.words))
-        
-        for row, word in enumerate(self.words):
-            # Checkbox
-            checkbox = QCheckBox()
-            checkbox.setChecked(True)  # Select all by default
-            self.table.setCellWidget(row, 0, checkbox)
-            
-            # Word data
-            data = [
-                word.get('original_word', ''),
-                word.get('nl_word', ''),
-                word.get('tl_sentence', ''),
-                word.get('nl_sentence', ''),
-                word.get('tl_plural', '')
-            ]
+        # Rows come from the model; use one fixed height and only measure rows
+        # whose sentences are long enough to wrap
+        # Repaint once at the end instead of after every row resize
+        self.table.setUpdatesEnabled(False)
+        try:
+            vertical_header = self.table.verticalHeader()
+            vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            vertical_header.setDefaultSectionSize(self.table.fontMetrics().height() + 10)
             
-            for col, text in enumerate(data, 1):
-                item = QTableWidgetItem(str(text))
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, col, item)
-        
-        # Adjust row heights
-        self.table.resizeRowsToContents()
+            for row in self.model.long_text_rows(self.WRAP_THRESHOLD):
+                self.table.resizeRowToContents(row)
+        finally:
+            self.table.setUpdatesEnabled(True)
     
     def select_all(self, checked: bool):
         """Select or deselect all words"""
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox:
-                checkbox.setChecked(checked)
+        self.model.set_all_checked(checked)
     
     def get_selected_words(self) -> List[Dict]:
         """Get list of selected words with any edits"""
-        selected = []
-        
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox and checkbox.isChecked():
-                # Get edited values from table
-                word_data = {
-                    'original_word': self.table.item(row, 1).text(),
-                    'nl_word': self.table.item(row, 2).text(),
-                    'tl_sentence': self.table.item(row, 3).text(),
-                    'nl_sentence': self.table.item(row, 4).text(),
-                    'tl_plural': self.table.item(row, 5).text(),
-                    'id': self.words[row].get('id', '')  # Keep original ID
-                }
-                selected.append(word_data)
-        
-        return selected
+        return self.model.get_selected_words()
     
     def import_selected_words(self):
         """Import selected words as Anki cards"""
@@ -1,12 +1,22 @@
 # dialogs/settings.py - Rewritten Settings Dialog
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
     QLineEdit, QComboBox, QCheckBox, QGroupBox, QFormLayout,
     QMessageBox, QTabWidget, QWidget
 )
-from PyQt6.QtCore import Qt
 from aqt import mw
 
+# Deck names from the last dialog opening, reused while the collection is unchanged
+_deck_name_cache = {"mod": None, "names": []}
+
+def _get_deck_names() -> list:
+    """Get deck names, rebuilding the list only after the collection changed"""
+    mod = mw.col.mod
+    if _deck_name_cache["mod"] != mod:
+        _deck_name_cache["names"] = [deck.name for deck in mw.col.decks.all_names_and_ids()]
+        _deck_name_cache["mod"] = mod
+    return _deck_name_cache["names"]
+
 class SettingsDialog(QDialog):
     """Settings configuration dialog"""
     
@@ -14,6 +24,7 @@ class SettingsDialog(QDialog):
         super().__init__(mw)
         self.config = config_manager
         self.api = api_client
+        self._deck_names = None  # List currently shown in the deck combo
         
         self.setWindowTitle("Word Management Settings")
         self.setFixedSize(500, 600)
@@ -22,10 +33,6 @@ class SettingsDialog(QDialog):
         self.setup_ui()
         self.load_current_settings()
     
-    def closeEvent(self, event):
-        """Ensure proper cleanup on close"""
-        super().closeEvent(event)
-    
     def setup_ui(self):
         layout = QVBoxLayout(self)
         
@@ -36,8 +43,8 @@ class SettingsDialog(QDialog):
         
         button_layout = QHBoxLayout()
         
-        test_btn = QPushButton("Test Connection")
-        test_btn.clicked.connect(self.test_connection)
+        self.test_btn = QPushButton("Test Connection")
+        self.test_btn.clicked.connect(self.test_connection)
         
         cancel_btn = QPushButton("Cancel")
         cancel_btn.clicked.connect(self.reject)
@@ -46,7 +53,7 @@ class SettingsDialog(QDialog):
         save_btn.clicked.connect(self.save_and_close)
         save_btn.setDefault(True)
         
-        button_layout.addWidget(test_btn)
+        button_layout.addWidget(self.test_btn)
         button_layout.addStretch()
         button_layout.addWidget(cancel_btn)
         button_layout.addWidget(save_btn)
@@ -83,9 +90,7 @@ class SettingsDialog(QDialog):
         
         self.deck_combo = QComboBox()
         self.deck_combo.setEditable(True)
-        if mw.col:
-            deck_names = [deck['name'] for deck in mw.col.decks.all()]
-            self.deck_combo.addItems(deck_names)
+        self.refresh_decks()
         anki_layout.addRow("Target Deck:", self.deck_combo)
         
         layout.addWidget(anki_group)
@@ -104,6 +109,24 @@ class SettingsDialog(QDialog):
         
         return widget
     
+    def refresh_decks(self):
+        """Fill the deck combo, skipping the rebuild when the deck list is unchanged"""
+        if not mw.col:
+            return
+        
+        deck_names = _get_deck_names()
+        if deck_names is self._deck_names:
+            return
+        self._deck_names = deck_names
+        
+        # Bulk insert without repaints or index/text change signals
+        self.deck_combo.setUpdatesEnabled(False)
+        self.deck_combo.blockSignals(True)
+        self.deck_combo.clear()
+        self.deck_combo.addItems(deck_names)
+        self.deck_combo.blockSignals(False)
+        self.deck_combo.setUpdatesEnabled(True)
+    
     def load_current_settings(self):
         """Load current settings from config"""
         self.server_url_edit.setText(self.config.get('server_url', ''))
@@ -125,12 +148,14 @@ class SettingsDialog(QDialog):
             QMessageBox.warning(self, "Error", "API Key is required")
             return
         
-        # Save each setting individually
-        self.config.set('server_url', server_url)
-        self.config.set('api_key', api_key)
-        self.config.set('deck_name', self.deck_combo.currentText().strip())
-        self.config.set('auto_upload_on_startup', self.auto_upload_check.isChecked())
-        self.config.set('auto_import_on_startup', self.auto_import_check.isChecked())
+        # Save all settings with a single config write
+        self.config.update({
+            'server_url': server_url,
+            'api_key': api_key,
+            'deck_name': self.deck_combo.currentText().strip(),
+            'auto_upload_on_startup': self.auto_upload_check.isChecked(),
+            'auto_import_on_startup': self.auto_import_check.isChecked(),
+        })
         
         QMessageBox.information(self, "Success", "Settings saved successfully")
         self.accept()
@@ -144,16 +169,22 @@ class SettingsDialog(QDialog):
             QMessageBox.warning(self, "Error", "Please enter both server URL and API key")
             return
         
-        # Save current values temporarily
-        original_url = self.config.get('server_url')
-        original_key = self.config.get('api_key')
-        
-        # Set test values
-        self.config.set('server_url', server_url)
-        self.config.set('api_key', api_key)
+        # Probe the server in the background so the dialog stays responsive;
+        # form values are passed directly and saved config is left untouched
+        self.test_btn.setEnabled(False)
+        self.test_btn.setText("Testing...")
+        mw.taskman.run_in_background(
+            lambda: self.api.test_connection(server_url=server_url, api_key=api_key),
+            self._on_test_finished
+        )
+    
+    def _on_test_finished(self, future):
+        """Show connection test result (main thread)"""
+        self.test_btn.setEnabled(True)
+        self.test_btn.setText("Test Connection")
         
         try:
-            success, message = self.api.test_connection()
+            success, message = future.result()
             
             if success:
                 QMessageBox.information(self, "Test Result", "✅ Connection successful!")
@@ -162,8 +193,3 @@ class SettingsDialog(QDialog):
         
         except Exception as e:
             QMessageBox.critical(self, "Test Result", f"❌ Test error:\n{str(e)}")
-        
-        finally:
-            # Restore original values
-            self.config.set('server_url', original_url)
-            self.config.set('api_key', original_key)
\ No newline at end of file
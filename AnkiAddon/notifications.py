@@ -1,24 +1,27 @@
 # notifications.py - Simple Notification System (Fixed)
+import logging
 from aqt.utils import tooltip, showInfo, showCritical
 from aqt.qt import QTimer
 from .utils import format_error_message
 
+log = logging.getLogger(__name__)
+
 class NotificationManager:
     """Simple notification manager for user feedback"""
     
     def __init__(self):
-        self.active_timers = []  # Track all timers for cleanup
+        self.active_timers = set()  # Track all timers for cleanup
     
     def cleanup(self):
         """Clean up all active timers"""
         try:
-            for timer in self.active_timers:
+            for timer in list(self.active_timers):
                 if timer and timer.isActive():
                     timer.stop()
             self.active_timers.clear()
-            print("NotificationManager cleanup completed")
-        except Exception as e:
-            print(f"Error during NotificationManager cleanup: {e}")
+            log.debug("NotificationManager cleanup completed")
+        except Exception:
+            log.exception("Error during NotificationManager cleanup")
     
     def success(self, message: str, duration: int = 2000) -> None:
         """Show success notification"""
@@ -43,25 +46,28 @@ class NotificationManager:
     
     def startup_complete(self, results: dict) -> None:
         """Show startup completion notification"""
-        messages = []
-        
-        if results.get('imported'):
-            messages.append(f"Imported {results['imported']} words")
+        imported = results.get('imported')
+        uploaded = results.get('uploaded')
+        errors = results.get('errors')
         
-        if results.get('uploaded'):
-            messages.append(f"Uploaded {results['uploaded']} cards")
+        # Nothing happened: skip building the summary
+        if not (imported or uploaded or errors):
+            tooltip("✅ Startup complete", period=1500)
+            return
         
-        if results.get('errors'):
-            messages.append(f"{results['errors']} errors")
+        messages = []
+        if imported:
+            messages.append(f"Imported {imported} words")
+        if uploaded:
+            messages.append(f"Uploaded {uploaded} cards")
+        if errors:
+            messages.append(f"{errors} errors")
         
-        if messages:
-            combined = " | ".join(messages)
-            if results.get('errors'):
-                tooltip(f"⚠️ {combined}", period=3000)
-            else:
-                tooltip(f"✅ {combined}", period=2500)
+        combined = " | ".join(messages)
+        if errors:
+            tooltip(f"⚠️ {combined}", period=3000)
         else:
-            tooltip("✅ Startup complete", period=1500)
+            tooltip(f"✅ {combined}", period=2500)
     
     def _create_timer(self, timeout_ms: int, callback) -> QTimer:
         """Create a timer with automatic cleanup tracking"""
@@ -69,14 +75,13 @@ class NotificationManager:
         timer.setSingleShot(True)
         timer.timeout.connect(callback)
         timer.timeout.connect(lambda: self._remove_timer(timer))  # Auto-cleanup
-        self.active_timers.append(timer)
+        self.active_timers.add(timer)
         timer.start(timeout_ms)
         return timer
     
     def _remove_timer(self, timer: QTimer) -> None:
         """Remove timer from tracking list"""
         try:
-            if timer in self.active_timers:
-                self.active_timers.remove(timer)
-        except Exception as e:
-            print(f"Error removing timer: {e}")
\ No newline at end of file
+            self.active_timers.discard(timer)
+        except Exception:
+            log.exception("Error removing timer")
\ No newline at end of file
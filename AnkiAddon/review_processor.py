@@ -1,13 +1,18 @@
 # review_processor.py - Review Data Processing (Enhanced)
+import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, date
 from aqt import mw
 
+log = logging.getLogger(__name__)
+
 class ReviewProcessor:
     """Handles review data extraction from Anki's existing data"""
     
     def __init__(self):
         self.session_gap_minutes = 30  # Gap to consider separate sessions
+        self.session_window_days = 30  # Days covered by the shared session scan
+        self._session_cache = None  # (revlog version, scan cutoff in ms, [(start ms, end ms, session)])
     
     def get_recent_sessions(self, days_back: int = 7) -> List[Dict[str, Any]]:
         """Extract session data from Anki's review log"""
@@ -15,35 +20,17 @@ class ReviewProcessor:
             return []
         
         try:
-            # Get cutoff timestamp
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            cutoff_timestamp = int(cutoff_date.timestamp() * 1000)
-            
-            # Query Anki's review log
-            reviews = mw.col.db.all("""
-                SELECT id, cid, usn, ease, ivl, lastIvl, factor, time, type
-                FROM revlog 
-                WHERE id > ?
-                ORDER BY id ASC
-            """, cutoff_timestamp)
-            
-            if not reviews:
+            session_metrics = self._load_sessions(days_back)
+            if not session_metrics:
                 return []
             
-            # Convert to review objects and group into sessions
-            review_objects = self._parse_reviews(reviews)
-            sessions = self._group_reviews_into_sessions(review_objects)
-            
-            # Calculate session metrics
-            session_metrics = [self._calculate_session_metrics(session) for session in sessions]
-            
             # Group sessions by date and deck, then merge
             merged_sessions = self._merge_sessions_by_date_and_deck(session_metrics)
             
             return merged_sessions
             
         except Exception as e:
-            print(f"Error getting recent sessions: {e}")
+            log.error("Error getting recent sessions: %s", e)
             return []
     
     def get_latest_session_only(self) -> Optional[Dict[str, Any]]:
@@ -59,87 +46,13 @@ class ReviewProcessor:
             return today_sessions[-1] if today_sessions else None
             
         except Exception as e:
-            print(f"Error getting latest session: {e}")
+            log.error("Error getting latest session: %s", e)
             return None
     
     def get_current_deck_state(self, deck_name: str = None) -> Dict[str, Any]:
         """Get current state for specific deck: due cards, overdue, etc."""
         if not mw.col:
-            print("No collection available")
-            return {}
-        
-        try:
-            # Get deck ID from name
-            deck_id = None
-            if deck_name:
-                try:
-                    deck_id = mw.col.decks.id(deck_name)
-                    print(f"Using deck: {deck_name} (ID: {deck_id})")
-                except Exception as e:
-                    print(f"Error getting deck ID for '{deck_name}': {e}")
-                    # Continue with all decks if specific deck not found
-            
-            # Get current counts from scheduler - with error handling
-            try:
-                if deck_id:
-                    # Get counts for specific deck
-                    cards_due_today, new_cards_available = self._get_deck_specific_counts(deck_id)
-                else:
-                    # Get counts for all decks
-                    counts = mw.col.sched.counts()
-                    cards_due_today = counts.learn + counts.review
-                    new_cards_available = counts.new
-            except Exception as e:
-                print(f"Error getting scheduler counts: {e}")
-                # Fallback: query database directly
-                cards_due_today = self._get_due_cards_fallback(deck_id)
-                new_cards_available = self._get_new_cards_fallback(deck_id)
-            
-            # Count overdue cards for specific deck
-            try:
-                overdue_count = self._get_overdue_cards_count(deck_id)
-            except Exception as e:
-                print(f"Error counting overdue cards: {e}")
-                overdue_count = 0
-            
-            # Get total cards for specific deck
-            try:
-                total_cards = self._get_total_cards_count(deck_id)
-            except Exception as e:
-                print(f"Error getting total card count: {e}")
-                total_cards = 0
-            
-            # Get last session date
-            last_session_date = self._get_last_session_date()
-            
-            result = {
-                "cards_due_today": cards_due_today,
-                "new_cards_available": new_cards_available,
-                "cards_overdue": overdue_count,
-                "total_cards": total_cards,
-                "last_session_date": last_session_date,
-                "deck_name": deck_name or "All Decks"
-            }
-            
-            print(f"Current deck state for '{deck_name or 'All Decks'}': {result}")
-            return result
-            
-        except Exception as e:
-            print(f"Error getting current deck state: {e}")
-            return {
-                "cards_due_today": 0,
-                "new_cards_available": 0,
-                "cards_overdue": 0,
-                "total_cards": 0,
-                "last_session_date": None,
-                "deck_name": deck_name or "All Decks",
-                "error": str(e)
-            }
-    
-    def get_current_deck_state(self, deck_name: str = None) -> Dict[str, Any]:
-        """Get current state for specific deck: due cards, overdue, etc."""
-        if not mw.col:
-            print("No collection available")
+            log.warning("No collection available")
             return {}
         
         try:
@@ -148,9 +61,9 @@ class ReviewProcessor:
             if deck_name:
                 try:
                     deck_id = mw.col.decks.id(deck_name)
-                    print(f"Using deck: {deck_name} (ID: {deck_id})")
+                    log.debug("Using deck: %s (ID: %s)", deck_name, deck_id)
                 except Exception as e:
-                    print(f"Error getting deck ID for '{deck_name}': {e}")
+                    log.error("Error getting deck ID for '%s': %s", deck_name, e)
                     # Try to find deck by name pattern
                     deck_id = self._find_deck_by_name(deck_name)
             
@@ -173,7 +86,7 @@ class ReviewProcessor:
                     total_cards = mw.col.card_count()
                     
             except Exception as e:
-                print(f"Error getting deck counts: {e}")
+                log.error("Error getting deck counts: %s", e)
                 cards_due_today = new_cards_available = overdue_count = total_cards = 0
             
             # Get last session date
@@ -189,11 +102,11 @@ class ReviewProcessor:
                 "deck_id": deck_id
             }
             
-            print(f"Current deck state for '{deck_name or 'All Decks'}': {result}")
+            log.debug("Current deck state for '%s': %s", deck_name or 'All Decks', result)
             return result
             
         except Exception as e:
-            print(f"Error getting current deck state: {e}")
+            log.error("Error getting current deck state: %s", e)
             return {
                 "cards_due_today": 0,
                 "new_cards_available": 0,
@@ -210,27 +123,27 @@ class ReviewProcessor:
             # Get all decks
             all_decks = mw.col.decks.all()
             
-            print(f"Available decks:")
+            log.debug("Available decks:")
             for deck in all_decks:
-                print(f"  - {deck['name']} (ID: {deck['id']})")
+                log.debug("  - %s (ID: %s)", deck['name'], deck['id'])
             
             # Try exact match first
             for deck in all_decks:
                 if deck['name'] == deck_name:
-                    print(f"Found exact match: {deck['name']} (ID: {deck['id']})")
+                    log.debug("Found exact match: %s (ID: %s)", deck['name'], deck['id'])
                     return deck['id']
             
             # Try partial match
             for deck in all_decks:
                 if deck_name.lower() in deck['name'].lower():
-                    print(f"Found partial match: {deck['name']} (ID: {deck['id']})")
+                    log.debug("Found partial match: %s (ID: %s)", deck['name'], deck['id'])
                     return deck['id']
             
-            print(f"No deck found matching '{deck_name}'")
+            log.warning("No deck found matching '%s'", deck_name)
             return None
             
         except Exception as e:
-            print(f"Error finding deck by name: {e}")
+            log.error("Error finding deck by name: %s", e)
             return None
     
     def _get_deck_counts(self, deck_id: int) -> tuple:
@@ -238,145 +151,28 @@ class ReviewProcessor:
         try:
             today = int(datetime.now().timestamp() / 86400)
             
-            print(f"Getting counts for deck ID: {deck_id}")
-            
-            # Debug: Check what cards exist for this deck
-            all_cards = mw.col.db.scalar("""
-                SELECT COUNT(*) FROM cards WHERE did = ?
-            """, deck_id) or 0
-            print(f"Total cards in deck: {all_cards}")
-            
-            # Get due cards (learning + review queues that are due today or earlier)
-            due_count = mw.col.db.scalar("""
-                SELECT COUNT(*) FROM cards 
-                WHERE did = ? AND queue IN (1, 2, 3) AND due <= ?
-            """, deck_id, today) or 0
-            print(f"Due cards: {due_count}")
-            
-            # Get new cards (queue 0)
-            new_count = mw.col.db.scalar("""
-                SELECT COUNT(*) FROM cards 
-                WHERE did = ? AND queue = 0
-            """, deck_id) or 0
-            print(f"New cards: {new_count}")
-            
-            # Get overdue cards (due before today)
-            overdue_count = mw.col.db.scalar("""
-                SELECT COUNT(*) FROM cards 
-                WHERE did = ? AND queue IN (1, 2, 3) AND due < ?
-            """, deck_id, today) or 0
-            print(f"Overdue cards: {overdue_count}")
-            
-            # Total cards in deck
-            total_count = all_cards
-            
-            # Debug: Show queue distribution
-            queue_counts = mw.col.db.all("""
-                SELECT queue, COUNT(*) FROM cards WHERE did = ? GROUP BY queue
-            """, deck_id)
-            print(f"Queue distribution: {queue_counts}")
+            # All four counts in one pass over the deck's cards:
+            # due = learning/review queues due today or earlier, overdue = due before today
+            total_count, due_count, new_count, overdue_count = mw.col.db.first("""
+                SELECT
+                    COUNT(*),
+                    SUM(CASE WHEN queue IN (1, 2, 3) AND due <= ? THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN queue = 0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN queue IN (1, 2, 3) AND due < ? THEN 1 ELSE 0 END)
+                FROM cards WHERE did = ?
+            """, today, today, deck_id)
+            
+            # SUM() is NULL for an empty deck
+            due_count, new_count, overdue_count = due_count or 0, new_count or 0, overdue_count or 0
+            log.debug("Deck %s counts: total=%s due=%s new=%s overdue=%s",
+                      deck_id, total_count, due_count, new_count, overdue_count)
             
             return due_count, new_count, overdue_count, total_count
             
         except Exception as e:
-            print(f"Error getting deck counts: {e}")
+            log.error("Error getting deck counts: %s", e)
             return 0, 0, 0, 0
     
-    def _get_deck_specific_counts(self, deck_id: int) -> tuple:
-        """Get due and new card counts for specific deck"""
-        try:
-            today = int(datetime.now().timestamp() / 86400)
-            
-            # Get due cards (learning + review) for this deck
-            due_count = mw.col.db.scalar("""
-                SELECT COUNT(*) FROM cards 
-                WHERE did = ? AND queue IN (1, 2, 3) AND due <= ?
-            """, deck_id, today) or 0
-            
-            # Get new cards for this deck
-            new_count = mw.col.db.scalar("""
-                SELECT COUNT(*) FROM cards 
-                WHERE did = ? AND queue = 0
-            """, deck_id) or 0
-            
-            return due_count, new_count
-            
-        except Exception as e:
-            print(f"Error getting deck specific counts: {e}")
-            return 0, 0
-    
-    def _get_due_cards_fallback(self, deck_id: int = None) -> int:
-        """Fallback method to get due cards count"""
-        try:
-            today = int(datetime.now().timestamp() / 86400)
-            
-            if deck_id:
-                due_count = mw.col.db.scalar("""
-                    SELECT COUNT(*) FROM cards 
-                    WHERE did = ? AND queue >= 0 AND due <= ?
-                """, deck_id, today) or 0
-            else:
-                due_count = mw.col.db.scalar("""
-                    SELECT COUNT(*) FROM cards 
-                    WHERE queue >= 0 AND due <= ?
-                """, today) or 0
-            return due_count
-        except Exception as e:
-            print(f"Error in due cards fallback: {e}")
-            return 0
-    
-    def _get_new_cards_fallback(self, deck_id: int = None) -> int:
-        """Fallback method to get new cards count"""
-        try:
-            if deck_id:
-                new_count = mw.col.db.scalar("""
-                    SELECT COUNT(*) FROM cards 
-                    WHERE did = ? AND queue = 0
-                """, deck_id) or 0
-            else:
-                new_count = mw.col.db.scalar("""
-                    SELECT COUNT(*) FROM cards 
-                    WHERE queue = 0
-                """) or 0
-            return new_count
-        except Exception as e:
-            print(f"Error in new cards fallback: {e}")
-            return 0
-    
-    def _get_overdue_cards_count(self, deck_id: int = None) -> int:
-        """Get overdue cards count for specific deck"""
-        try:
-            today = int(datetime.now().timestamp() / 86400)
-            
-            if deck_id:
-                overdue_count = mw.col.db.scalar("""
-                    SELECT COUNT(*) FROM cards 
-                    WHERE did = ? AND queue >= 0 AND due < ?
-                """, deck_id, today) or 0
-            else:
-                overdue_count = mw.col.db.scalar("""
-                    SELECT COUNT(*) FROM cards 
-                    WHERE queue >= 0 AND due < ?
-                """, today) or 0
-            return overdue_count
-        except Exception as e:
-            print(f"Error counting overdue cards: {e}")
-            return 0
-    
-    def _get_total_cards_count(self, deck_id: int = None) -> int:
-        """Get total cards count for specific deck"""
-        try:
-            if deck_id:
-                total_count = mw.col.db.scalar("""
-                    SELECT COUNT(*) FROM cards WHERE did = ?
-                """, deck_id) or 0
-            else:
-                total_count = mw.col.card_count()
-            return total_count
-        except Exception as e:
-            print(f"Error getting total cards count: {e}")
-            return 0
-    
     def get_overall_metrics(self, days_back: int = 30) -> Dict[str, Any]:
         """Calculate overall metrics from recent review history"""
         try:
@@ -386,18 +182,21 @@ class ReviewProcessor:
             if not all_sessions:
                 return {}
             
+            # All-decks state, read once for the procrastination and burnout metrics
+            current_state = self.get_current_deck_state()
+            
             return {
                 "motivation_trend": self._calculate_motivation_trend(all_sessions),
                 "engagement_score": self._calculate_engagement_score(all_sessions),
-                "procrastination_indicator": self._calculate_procrastination_indicator(all_sessions),
-                "burnout_risk_score": self._calculate_burnout_risk(all_sessions),
+                "procrastination_indicator": self._calculate_procrastination_indicator(all_sessions, current_state),
+                "burnout_risk_score": self._calculate_burnout_risk(all_sessions, current_state),
                 "avg_session_duration": self._calculate_avg_session_duration(all_sessions),
                 "total_sessions": len(all_sessions),
                 "total_cards_reviewed": sum(s.get('cards_reviewed', 0) for s in all_sessions)
             }
             
         except Exception as e:
-            print(f"Error calculating overall metrics: {e}")
+            log.error("Error calculating overall metrics: %s", e)
             return {}
     
     def _get_all_sessions_for_metrics(self, days_back: int) -> List[Dict[str, Any]]:
@@ -406,32 +205,38 @@ class ReviewProcessor:
             return []
         
         try:
-            # Get cutoff timestamp
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            cutoff_timestamp = int(cutoff_date.timestamp() * 1000)
-            
-            # Query Anki's review log
-            reviews = mw.col.db.all("""
-                SELECT id, cid, usn, ease, ivl, lastIvl, factor, time, type
-                FROM revlog 
-                WHERE id > ?
-                ORDER BY id ASC
-            """, cutoff_timestamp)
-            
-            if not reviews:
-                return []
-            
-            # Convert to review objects and group into sessions
-            review_objects = self._parse_reviews(reviews)
-            sessions = self._group_reviews_into_sessions(review_objects)
-            
-            # Calculate session metrics (don't merge for overall metrics)
-            return [self._calculate_session_metrics(session) for session in sessions]
+            # Individual sessions; don't merge for overall metrics
+            return self._load_sessions(days_back)
             
         except Exception as e:
-            print(f"Error getting sessions for metrics: {e}")
+            log.error("Error getting sessions for metrics: %s", e)
             return []
     
+    def _load_sessions(self, days_back: int) -> List[Dict[str, Any]]:
+        """Per-session metrics for the last days_back days, filtered from one shared scan"""
+        # Latest-session and overall-metrics callers share a single scan of the widest
+        # window; it starts at midnight, so an earlier scan still covers later requests
+        version = (mw.col.mod, mw.col.db.scalar("SELECT MAX(id) FROM revlog"))
+        scan_days = max(days_back, self.session_window_days)
+        scan_start = datetime.combine(date.today() - timedelta(days=scan_days), datetime.min.time())
+        scan_cutoff = int(scan_start.timestamp() * 1000)
+        
+        cached = self._session_cache
+        if cached is None or cached[0] != version or cached[1] > scan_cutoff:
+            last_review = version[1] or scan_cutoff
+            cached = self._session_cache = (version, scan_cutoff, self._query_session_metrics(scan_cutoff, last_review))
+        
+        cutoff_timestamp = int((datetime.now() - timedelta(days=days_back)).timestamp() * 1000)
+        sessions = []
+        for start_ms, end_ms, session in cached[2]:
+            if start_ms > cutoff_timestamp:
+                sessions.append(dict(session))
+            elif end_ms > cutoff_timestamp:
+                # Session straddles the cutoff: re-aggregate only its reviews inside the window
+                sessions.extend(session for _, _, session in
+                                self._query_session_metrics(cutoff_timestamp, end_ms))
+        return sessions
+    
     def _merge_sessions_by_date_and_deck(self, sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Merge sessions by date and deck"""
         if not sessions:
@@ -531,109 +336,65 @@ class ReviewProcessor:
             "merged_sessions_count": len(sessions)  # Track how many sessions were merged
         }
     
-    def _parse_reviews(self, raw_reviews: List) -> List[Dict[str, Any]]:
-        """Parse raw review data from database"""
-        reviews = []
-        
-        for review in raw_reviews:
-            review_time = datetime.fromtimestamp(review[0] / 1000)  # Convert from ms
-            
-            reviews.append({
-                "review_time": review_time,
-                "card_id": review[1],
-                "ease": review[3],  # 1=Again, 2=Hard, 3=Good, 4=Easy
-                "response_time": review[7] / 1000.0,  # Convert to seconds
-                "review_type": review[8],  # 0=learn, 1=review, 2=relearn, 3=filtered
-                "interval": review[4],  # New interval
-                "previous_interval": review[5]  # Previous interval
-            })
-        
-        return reviews
-    
-    def _group_reviews_into_sessions(self, reviews: List[Dict]) -> List[List[Dict]]:
-        """Group reviews into sessions based on time gaps"""
-        if not reviews:
-            return []
+    def _query_session_metrics(self, cutoff_timestamp: int, end_timestamp: int) -> List[tuple]:
+        """Split reviews in (cutoff, end] into sessions and aggregate each one in SQLite, as (start ms, end ms, session) tuples"""
+        gap_ms = self.session_gap_minutes * 60 * 1000
+        
+        # A review starts a new session when it follows the previous one by more than
+        # the gap; a running sum of those starts numbers the sessions (gaps and islands)
+        rows = mw.col.db.all("""
+            WITH gaps AS (
+                SELECT id, cid, ease, ivl, time, type,
+                       id - LAG(id) OVER (ORDER BY id) AS gap
+                FROM revlog
+                WHERE id > ? AND id <= ?
+            ),
+            numbered AS (
+                SELECT *,
+                       SUM(CASE WHEN gap IS NULL OR gap > ? THEN 1 ELSE 0 END)
+                           OVER (ORDER BY id) AS session
+                FROM gaps
+            )
+            SELECT
+                MIN(id), MAX(id), COUNT(*),
+                SUM(ease >= 3),
+                SUM(ease = 1), SUM(ease = 2), SUM(ease = 3), SUM(ease = 4),
+                AVG(CASE WHEN time > 0 THEN time END),
+                COUNT(DISTINCT CASE WHEN type = 0 AND ivl >= 1 THEN cid END)
+            FROM numbered
+            GROUP BY session
+            ORDER BY session
+        """, cutoff_timestamp, end_timestamp, gap_ms)
         
         sessions = []
-        current_session = [reviews[0]]
-        
-        for i in range(1, len(reviews)):
-            current_review = reviews[i]
-            previous_review = reviews[i-1]
-            
-            # Calculate time gap in minutes
-            time_gap = (current_review["review_time"] - previous_review["review_time"]).total_seconds() / 60
-            
-            if time_gap > self.session_gap_minutes:
-                # End current session, start new one
-                sessions.append(current_session)
-                current_session = [current_review]
-            else:
-                current_session.append(current_review)
-        
-        # Add the last session
-        if current_session:
-            sessions.append(current_session)
+        for (start_ms, end_ms, total_reviews, correct_reviews,
+             again, hard, good, easy, avg_time_ms, new_cards_learned) in rows:
+            # Only session bounds are converted to datetimes, not every review
+            start_time = datetime.fromtimestamp(start_ms / 1000)
+            end_time = datetime.fromtimestamp(end_ms / 1000)
+            duration_minutes = (end_time - start_time).total_seconds() / 60
+            
+            # time is in ms; reviews with no recorded time are excluded from the average
+            avg_response_time = avg_time_ms / 1000.0 if avg_time_ms else 0
+            
+            sessions.append((start_ms, end_ms, {
+                "date": start_time.date().isoformat(),
+                "session_start": start_time.isoformat(),
+                "session_end": end_time.isoformat(),
+                "duration_minutes": round(duration_minutes, 1),
+                "cards_reviewed": total_reviews,
+                "correct_reviews": correct_reviews,
+                "success_rate": round(correct_reviews / total_reviews, 3) if total_reviews > 0 else 0,
+                "avg_response_time": round(avg_response_time, 1),
+                "new_cards_learned": new_cards_learned,  # New cards that graduated (interval >= 1 day)
+                "reviews_again": again,
+                "reviews_hard": hard,
+                "reviews_good": good,
+                "reviews_easy": easy
+            }))
         
         return sessions
     
-    def _calculate_session_metrics(self, session_reviews: List[Dict]) -> Dict[str, Any]:
-        """Calculate metrics for a single session"""
-        if not session_reviews:
-            return {}
-        
-        # Basic session info
-        start_time = session_reviews[0]["review_time"]
-        end_time = session_reviews[-1]["review_time"]
-        duration_minutes = (end_time - start_time).total_seconds() / 60
-        
-        # Review outcomes
-        total_reviews = len(session_reviews)
-        correct_reviews = sum(1 for r in session_reviews if r["ease"] >= 3)  # Good or Easy
-        
-        # Button distribution
-        button_counts = {"again": 0, "hard": 0, "good": 0, "easy": 0}
-        for review in session_reviews:
-            ease = review["ease"]
-            if ease == 1:
-                button_counts["again"] += 1
-            elif ease == 2:
-                button_counts["hard"] += 1
-            elif ease == 3:
-                button_counts["good"] += 1
-            elif ease == 4:
-                button_counts["easy"] += 1
-        
-        # Response times
-        response_times = [r["response_time"] for r in session_reviews if r["response_time"] > 0]
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-        
-        # Count NEW CARDS LEARNED - Fixed logic
-        # Count unique cards that were new (review_type 0) and graduated (interval >= 1 day)
-        new_cards_graduated = set()
-        for review in session_reviews:
-            if review["review_type"] == 0 and review["interval"] >= 1:  # New card that graduated
-                new_cards_graduated.add(review["card_id"])
-        
-        new_cards_learned = len(new_cards_graduated)
-        
-        return {
-            "date": start_time.date().isoformat(),
-            "session_start": start_time.isoformat(),
-            "session_end": end_time.isoformat(),
-            "duration_minutes": round(duration_minutes, 1),
-            "cards_reviewed": total_reviews,
-            "correct_reviews": correct_reviews,
-            "success_rate": round(correct_reviews / total_reviews, 3) if total_reviews > 0 else 0,
-            "avg_response_time": round(avg_response_time, 1),
-            "new_cards_learned": new_cards_learned,
-            "reviews_again": button_counts["again"],
-            "reviews_hard": button_counts["hard"],
-            "reviews_good": button_counts["good"],
-            "reviews_easy": button_counts["easy"]
-        }
-    
     def _calculate_motivation_trend(self, sessions: List[Dict]) -> float:
         """Calculate motivation trend (-1 to 1, based on session frequency and quality)"""
         if len(sessions) < 4:  # Need at least 4 sessions for trend
@@ -681,11 +442,9 @@ class ReviewProcessor:
         engagement = (consistency_score * 0.4 + avg_quality * 0.4 + completion_rate * 0.2)
         return round(engagement, 3)
     
-    def _calculate_procrastination_indicator(self, sessions: List[Dict]) -> float:
+    def _calculate_procrastination_indicator(self, sessions: List[Dict], current_state: Dict[str, Any]) -> float:
         """Calculate procrastination indicator (0 to 1, higher = more procrastination)"""
         try:
-            current_state = self.get_current_deck_state()
-            
             # Factor 1: Overdue cards ratio
             total_due = current_state.get("cards_due_today", 0) + current_state.get("cards_overdue", 0)
             overdue_ratio = current_state.get("cards_overdue", 0) / max(total_due, 1)
@@ -711,10 +470,10 @@ class ReviewProcessor:
             return round(min(procrastination, 1.0), 3)
             
         except Exception as e:
-            print(f"Error calculating procrastination indicator: {e}")
+            log.error("Error calculating procrastination indicator: %s", e)
             return 0.0
     
-    def _calculate_burnout_risk(self, sessions: List[Dict]) -> float:
+    def _calculate_burnout_risk(self, sessions: List[Dict], current_state: Dict[str, Any]) -> float:
         """Calculate burnout risk (0 to 1, based on declining performance + high workload)"""
         if len(sessions) < 5:
             return 0.0
@@ -735,7 +494,6 @@ class ReviewProcessor:
         response_time_increase = max(0, (recent_response_time - older_response_time) / max(older_response_time, 1))
         
         # Factor 3: High workload
-        current_state = self.get_current_deck_state()
         total_due = current_state.get("cards_due_today", 0) + current_state.get("cards_overdue", 0)
         workload_pressure = min(total_due / 100, 1.0)  # Normalize to 100 cards
         
@@ -809,7 +567,7 @@ class ReviewProcessor:
             return streak
             
         except Exception as e:
-            print(f"Error calculating current streak: {e}")
+            log.error("Error calculating current streak: %s", e)
             return 0
     
     def _get_last_session_date(self) -> Optional[str]:
@@ -829,5 +587,5 @@ class ReviewProcessor:
             return None
             
         except Exception as e:
-            print(f"Error getting last session date: {e}")
+            log.error("Error getting last session date: %s", e)
             return None
\ No newline at end of file
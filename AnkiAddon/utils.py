@@ -1,14 +1,28 @@
 # utils.py - Shared Utilities
 import html
 import re
+from functools import lru_cache
 from typing import Optional
 
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Color mapping for German articles
+_ARTICLE_COLORS = {
+    "der": "#5555ff",  # Blue for masculine
+    "das": "#00aa00",  # Green for neuter
+    "die": "#ff55ff"   # Magenta for feminine
+}
+
+@lru_cache(maxsize=4096)
 def clean_html(text: str) -> str:
     """Remove HTML tags and decode HTML entities"""
     if not text:
         return ""
+    # Plain text needs no regex or entity pass
+    if '<' not in text and '&' not in text:
+        return text.strip()
     # Remove HTML tags
-    cleaned = re.sub(r'<[^>]+>', '', text)
+    cleaned = _TAG_RE.sub('', text)
     # Decode HTML entities
     cleaned = html.unescape(cleaned)
     return cleaned.strip()
@@ -18,30 +32,30 @@ def color_german_word(word: str) -> str:
     if not word:
         return word
     
-    # Color mapping for German articles
-    article_colors = {
-        "der": "#5555ff",  # Blue for masculine
-        "das": "#00aa00",  # Green for neuter  
-        "die": "#ff55ff"   # Magenta for feminine
-    }
-    
-    parts = word.split()
-    if len(parts) >= 2 and parts[0].lower() in article_colors:
-        color = article_colors[parts[0].lower()]
+    # Only the leading article matters: match it as a prefix followed by whitespace
+    # and at least one more word, without splitting the whole string
+    stripped = word.lstrip()
+    color = _ARTICLE_COLORS.get(stripped[:3].lower())
+    if color and len(stripped) > 3 and stripped[3].isspace() and stripped[4:].strip():
         return f'<span style="color: {color};">{word}</span>'
     
     return word
 
 def format_error_message(error: Exception) -> str:
     """Format error message for user display"""
-    error_msg = str(error)
+    return _format_error_text(str(error))
+
+@lru_cache(maxsize=128)
+def _format_error_text(error_msg: str) -> str:
+    """Map an error message to user-facing text (repeated errors hit the cache)"""
+    lowered = error_msg.lower()
     
     # Common error message mappings
-    if "timeout" in error_msg.lower():
+    if "timeout" in lowered:
         return "Connection timeout - server is taking too long to respond"
-    elif "connection" in error_msg.lower() or "network" in error_msg.lower():
+    elif "connection" in lowered or "network" in lowered:
         return "Network error - cannot reach server"
-    elif "401" in error_msg or "unauthorized" in error_msg.lower():
+    elif "401" in error_msg or "unauthorized" in lowered:
         return "Authentication failed - check your API key"
     elif "404" in error_msg:
         return "Server endpoint not found - check server URL"
@@ -20,6 +20,50 @@ async def push_anki_cards(card_list: AnkiCardList, api_key: str = Depends(verify
             detail=f"Error storing Anki cards: {str(e)}"
         )
 
+@router.post("/cards/replace", response_model=AnkiCardResponse)
+async def replace_anki_cards(card_list: AnkiCardList, api_key: str = Depends(verify_api_key)):
+    """Replace all stored Anki cards atomically (clear + insert in one transaction)"""
+    try:
+        return AnkiService.replace_anki_cards(card_list)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error replacing Anki cards: {str(e)}"
+        )
+
+@router.post("/cards/replace/{upload_id}/batch", response_model=AnkiCardResponse)
+async def stage_anki_cards(upload_id: str, card_list: AnkiCardList, api_key: str = Depends(verify_api_key)):
+    """Stage one batch of a replace that is too large for a single request"""
+    try:
+        return AnkiService.stage_anki_cards(upload_id, card_list)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error staging Anki cards: {str(e)}"
+        )
+
+@router.post("/cards/replace/{upload_id}/commit", response_model=AnkiCardResponse)
+async def commit_staged_anki_cards(upload_id: str, api_key: str = Depends(verify_api_key)):
+    """Replace all stored Anki cards with the staged batches atomically"""
+    try:
+        return AnkiService.commit_staged_anki_cards(upload_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error replacing Anki cards: {str(e)}"
+        )
+
+@router.delete("/cards/replace/{upload_id}")
+async def discard_staged_anki_cards(upload_id: str, api_key: str = Depends(verify_api_key)):
+    """Discard the staged batches of a replace that will not be committed"""
+    try:
+        return AnkiService.discard_staged_anki_cards(upload_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error discarding staged Anki cards: {str(e)}"
+        )
+
 @router.get("/cards", response_model=List[AnkiCardData])
 async def get_anki_cards(
     limit: Optional[int] = 1000,
@@ -56,6 +56,19 @@ def init_database():
         CREATE INDEX IF NOT EXISTS idx_anki_cards_card_id ON anki_cards(card_id)
     """)
     
+    # Staged cards of a batched replace, moved into anki_cards on commit
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS anki_cards_staging (
+            upload_id TEXT NOT NULL,
+            card_id TEXT NOT NULL,
+            tl_word TEXT NOT NULL,
+            tl_sentence TEXT NOT NULL,
+            nl_word TEXT NOT NULL,
+            nl_sentence TEXT NOT NULL,
+            PRIMARY KEY (upload_id, card_id)
+        )
+    """)
+    
     conn.commit()
     conn.close()
 
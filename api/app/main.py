@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import os
 from app.api.router import api_router
 from app.database.connection import init_database
+from app.middleware.gzip_request import GZipRequestMiddleware
 from app.services.queue_service import queue_worker
 
 def get_cors_origins():
@@ -38,6 +40,12 @@ def create_application() -> FastAPI:
         allow_headers=["Authorization", "Content-Type", "Accept"],
     )
     
+    # Compress larger responses (e.g. processed word lists) for clients sending Accept-Encoding
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    
+    # Accept gzip-compressed request bodies (large analytics uploads from the add-on)
+    app.add_middleware(GZipRequestMiddleware)
+    
     # Include API routes
     app.include_router(api_router, prefix="/api/v1")
     
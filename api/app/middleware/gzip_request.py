@@ -0,0 +1,80 @@
+import zlib
+
+# Upper bound for a decompressed request body; guards against gzip bombs
+MAX_DECOMPRESSED_SIZE = 10 * 1024 * 1024
+
+class GZipRequestMiddleware:
+    """Transparently decompress request bodies sent with Content-Encoding: gzip"""
+    
+    def __init__(self, app, max_size: int = MAX_DECOMPRESSED_SIZE):
+        self.app = app
+        self.max_size = max_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict(scope["headers"])
+        if headers.get(b"content-encoding", b"").lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+        
+        # Decompress chunk by chunk as the body arrives, never producing more
+        # than max_size bytes of output
+        decompressor = zlib.decompressobj(wbits=31)
+        parts = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            data = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            try:
+                while data:
+                    output = decompressor.decompress(data, self.max_size - size + 1)
+                    size += len(output)
+                    if size > self.max_size:
+                        await self._send_error(send, 413, "Decompressed request body too large")
+                        return
+                    parts.append(output)
+                    data = decompressor.unconsumed_tail
+            except zlib.error:
+                await self._send_error(send, 400, "Invalid gzip request body")
+                return
+        
+        if not decompressor.eof:
+            await self._send_error(send, 400, "Invalid gzip request body")
+            return
+        
+        body = b"".join(parts)
+        
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode())]
+        
+        body_sent = False
+        
+        async def receive_decompressed():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        await self.app(scope, receive_decompressed, send)
+    
+    @staticmethod
+    async def _send_error(send, status: int, detail: str):
+        """Reply with a JSON error without calling the app"""
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": f'{{"detail":"{detail}"}}'.encode()})
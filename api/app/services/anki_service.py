@@ -56,6 +56,97 @@ class AnkiService:
             timestamp=datetime.now().isoformat()
         )
     
+    @staticmethod
+    def replace_anki_cards(card_list: AnkiCardList) -> AnkiCardResponse:
+        """Replace all stored Anki cards in a single transaction"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM anki_cards")
+            cursor.executemany("""
+                INSERT OR REPLACE INTO anki_cards (card_id, tl_word, tl_sentence, nl_word, nl_sentence)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                (card.card_id, card.tl_word, card.tl_sentence, card.nl_word, card.nl_sentence)
+                for card in card_list.cards
+            ])
+            
+            conn.commit()
+        
+        return AnkiCardResponse(
+            message="Anki cards replaced successfully",
+            cards_received=len(card_list.cards),
+            cards_inserted=len(card_list.cards),
+            cards_updated=0,
+            timestamp=datetime.now().isoformat()
+        )
+    
+    @staticmethod
+    def stage_anki_cards(upload_id: str, card_list: AnkiCardList) -> AnkiCardResponse:
+        """Stage one batch of a replace; stored cards are untouched until commit"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT OR REPLACE INTO anki_cards_staging
+                    (upload_id, card_id, tl_word, tl_sentence, nl_word, nl_sentence)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (upload_id, card.card_id, card.tl_word, card.tl_sentence, card.nl_word, card.nl_sentence)
+                for card in card_list.cards
+            ])
+            
+            conn.commit()
+        
+        return AnkiCardResponse(
+            message="Anki cards staged successfully",
+            cards_received=len(card_list.cards),
+            cards_inserted=len(card_list.cards),
+            cards_updated=0,
+            timestamp=datetime.now().isoformat()
+        )
+    
+    @staticmethod
+    def commit_staged_anki_cards(upload_id: str) -> AnkiCardResponse:
+        """Replace all stored Anki cards with the staged ones in a single transaction"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM anki_cards")
+            cursor.execute("""
+                INSERT INTO anki_cards (card_id, tl_word, tl_sentence, nl_word, nl_sentence)
+                SELECT card_id, tl_word, tl_sentence, nl_word, nl_sentence
+                FROM anki_cards_staging
+                WHERE upload_id = ?
+            """, (upload_id,))
+            count = cursor.rowcount
+            cursor.execute("DELETE FROM anki_cards_staging WHERE upload_id = ?", (upload_id,))
+            
+            conn.commit()
+        
+        return AnkiCardResponse(
+            message="Anki cards replaced successfully",
+            cards_received=count,
+            cards_inserted=count,
+            cards_updated=0,
+            timestamp=datetime.now().isoformat()
+        )
+    
+    @staticmethod
+    def discard_staged_anki_cards(upload_id: str) -> dict:
+        """Drop the staged cards of an abandoned replace"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM anki_cards_staging WHERE upload_id = ?", (upload_id,))
+            count = cursor.rowcount
+            conn.commit()
+            
+            return {
+                "message": "Staged Anki cards discarded",
+                "deleted_count": count
+            }
+    
     @staticmethod
     def get_all_anki_cards(limit: int = 1000) -> List[AnkiCardData]:
         """Get all stored Anki cards"""